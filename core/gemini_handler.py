@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 
 import sys
+import threading
 import time
 import mimetypes
 import traceback
 from io import BytesIO
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple, Union
+from types import SimpleNamespace
+from typing import Optional, List, Dict, Any, Tuple, Union, Callable
 
 from PIL import Image
 
@@ -62,6 +64,10 @@ class GeminiHandler(QObject):
         self.clients: Dict[str, genai.Client] = {}
         self.available_models_cache: Dict[str, List[Dict[str, Any]]] = {}
         self._keys_currently_fetching_models: set[str] = set()
+        # Key validation and model listing also run on QThreadPool threads (single mode's
+        # _ModelListTask), so the dicts/set above are only touched while holding this lock.
+        # Network calls are made outside it.
+        self._state_lock = threading.RLock()
 
     def get_or_initialize_client(self, api_key_name: str, api_key_value: str) -> Optional[genai.Client]:
         """
@@ -80,9 +86,11 @@ class GeminiHandler(QObject):
             return None
 
         # 1. Check if a validated client already exists for this name
-        if api_key_name in self.clients:
+        with self._state_lock:
+            existing_client = self.clients.get(api_key_name)
+        if existing_client is not None:
              log_debug(f"Returning existing client for key name: {api_key_name}")
-             return self.clients[api_key_name]
+             return existing_client
 
         # 2. Attempt to initialize and validate a new client
         log_info(f"Initializing and validating new GenAI Client for key name: {api_key_name}...")
@@ -97,8 +105,9 @@ class GeminiHandler(QObject):
             _ = list(new_client.models.list(config={'page_size': 1})) # Validation call
 
             log_info(f"Client for '{api_key_name}' initialized and validated successfully.")
-            self.clients[api_key_name] = new_client
-            return new_client
+            with self._state_lock:
+                # Another thread may have validated the same key meanwhile; keep the first client
+                return self.clients.setdefault(api_key_name, new_client)
 
         except google_api_core_exceptions.PermissionDenied as perm_err:
              log_error(f"API Key Error during validation for '{api_key_name}': Permission Denied. Check key validity and Gemini API permissions. Details: {perm_err}")
@@ -110,23 +119,31 @@ class GeminiHandler(QObject):
 
     def is_client_available(self, api_key_name: str) -> bool:
         """Checks if a validated client exists for the given API key name."""
-        return api_key_name in self.clients
+        with self._state_lock:
+            return api_key_name in self.clients
+
+    def get_cached_models(self, api_key_name: str) -> Optional[List[Dict[str, Any]]]:
+        """Returns the cached model list for the key, or None if it has not been fetched."""
+        with self._state_lock:
+            return self.available_models_cache.get(api_key_name)
 
     def shutdown_client(self, api_key_name: str):
         """Removes a specific client and its associated cache."""
-        if api_key_name in self.clients:
+        with self._state_lock:
+            had_client = self.clients.pop(api_key_name, None) is not None
+            if had_client:
+                self.available_models_cache.pop(api_key_name, None)
+        if had_client:
             log_info(f"Shutting down client and clearing cache for key: {api_key_name}")
-            del self.clients[api_key_name]
-            if api_key_name in self.available_models_cache:
-                del self.available_models_cache[api_key_name]
         else:
             log_debug(f"No active client found to shut down for key: {api_key_name}")
 
     def shutdown_all_clients(self):
          """Removes all stored clients and clears caches."""
          log_info("Shutting down all Gemini clients and clearing caches.")
-         self.clients.clear()
-         self.available_models_cache.clear()
+         with self._state_lock:
+             self.clients.clear()
+             self.available_models_cache.clear()
 
 
 
@@ -136,10 +153,14 @@ class GeminiHandler(QObject):
             log_error(f"Cannot list models for '{api_key_name}': Client not available or failed initialization.")
             return []
 
-        # Check cache first IF NOT forcing refresh
-        if not force_refresh and api_key_name in self.available_models_cache:
+        # Check cache first IF NOT forcing refresh; claim the fetch in the same locked step
+        with self._state_lock:
+            cached_list = None if force_refresh else self.available_models_cache.get(api_key_name)
+            already_fetching = cached_list is None and api_key_name in self._keys_currently_fetching_models
+            if cached_list is None and not already_fetching:
+                self._keys_currently_fetching_models.add(api_key_name)
+        if cached_list is not None:
              log_info(f"Returning cached list of models for key: {api_key_name}")
-             cached_list = self.available_models_cache[api_key_name]
              # Emit signal even when returning cached data, so UI can update if needed
              # Wrap emit in try-except in case signal connection is problematic
              try:
@@ -149,12 +170,10 @@ class GeminiHandler(QObject):
              return cached_list
 
         # Prevent Concurrent Fetches
-        if api_key_name in self._keys_currently_fetching_models:
+        if already_fetching:
             log_warning(f"Model fetch already in progress for key '{api_key_name}'. Returning empty list for now.")
             return []
 
-        self._keys_currently_fetching_models.add(api_key_name)
-
         log_info(f"Fetching available models from API for key: {api_key_name}...")
         models_list = []
         fetched_models = [] # Store the result before updating cache/emitting signal
@@ -198,11 +217,13 @@ class GeminiHandler(QObject):
             log_error(f"Unexpected error listing models for '{api_key_name}': {e}", exc_info=True)
             error_occurred = True
         finally:
-            self._keys_currently_fetching_models.discard(api_key_name)
+            with self._state_lock:
+                self._keys_currently_fetching_models.discard(api_key_name)
             log_debug(f"Model fetch finished for key '{api_key_name}'. Lock released.")
 
         if not error_occurred:
-            self.available_models_cache[api_key_name] = fetched_models
+            with self._state_lock:
+                self.available_models_cache[api_key_name] = fetched_models
             try:
                 self.models_updated.emit(api_key_name, fetched_models)
             except Exception as emit_err:
@@ -269,8 +290,46 @@ class GeminiHandler(QObject):
     def shutdown_all_clients(self):
         """Removes all stored clients and clears caches."""
         log_info("Shutting down all Gemini clients and clearing caches.")
-        self.clients.clear()
-        self.available_models_cache.clear()
+        with self._state_lock:
+            self.clients.clear()
+            self.available_models_cache.clear()
+
+    @staticmethod
+    def _collect_text_stream(stream, text_chunk_callback: Callable[[str], None]) -> SimpleNamespace:
+        """
+        Consumes a generate_content_stream iterator, passing each text fragment to
+        text_chunk_callback, and folds the chunks into one response-shaped object
+        (first candidate's text joined, last finish reason / safety ratings / usage)
+        for the normal response processing in generate().
+        """
+        text_fragments: List[str] = []
+        prompt_feedback = None; usage_metadata = None
+        finish_reason = None; safety_ratings = None; has_candidate = False
+        for chunk in stream:
+            if getattr(chunk, 'prompt_feedback', None): prompt_feedback = chunk.prompt_feedback
+            if getattr(chunk, 'usage_metadata', None): usage_metadata = chunk.usage_metadata
+            if not chunk.candidates:
+                continue
+            candidate = chunk.candidates[0]
+            has_candidate = True
+            if getattr(candidate, 'finish_reason', None): finish_reason = candidate.finish_reason
+            if getattr(candidate, 'safety_ratings', None): safety_ratings = candidate.safety_ratings
+            if candidate.content and candidate.content.parts:
+                for part in candidate.content.parts:
+                    if getattr(part, 'text', None):
+                        text_fragments.append(part.text)
+                        text_chunk_callback(part.text)
+
+        candidates = []
+        if has_candidate:
+            # Stream fragments are pieces of the same text, so they are joined without separators
+            parts = [SimpleNamespace(text="".join(text_fragments), inline_data=None)] if text_fragments else []
+            candidates.append(SimpleNamespace(
+                content=SimpleNamespace(parts=parts),
+                finish_reason=finish_reason,
+                safety_ratings=safety_ratings
+            ))
+        return SimpleNamespace(candidates=candidates, prompt_feedback=prompt_feedback, usage_metadata=usage_metadata)
     
 
 
@@ -290,11 +349,15 @@ class GeminiHandler(QObject):
         top_p: Optional[float] = None,
         max_output_tokens: Optional[int] = None,
         safety_settings_dict: Optional[Dict[Any, Any]] = None, # Expects Dict[HarmCategory, HarmBlockThreshold] or None
-        request_timeout: Optional[int] = None # NOTE: Timeout not directly supported by generate_content config
+        request_timeout: Optional[int] = None, # NOTE: Timeout not directly supported by generate_content config
+        text_chunk_callback: Optional[Callable[[str], None]] = None # Receives text as it streams in (TEXT-only requests)
     ) -> Dict[str, Any]:
         """
         Generates content using the specified API key, model, and parameters,
         expecting an already resolved prompt text. Strictly follows google-genai SDK patterns.
+        With text_chunk_callback, TEXT-only requests are streamed (generate_content_stream)
+        and each text fragment is passed to the callback as it arrives; the returned
+        result dict is the same as for a non-streamed call.
         """
 
         # 1. Get Client & Validate Inputs
@@ -375,7 +438,7 @@ class GeminiHandler(QObject):
         elif not safety_settings_dict: log_debug("Empty safety settings dict provided. Using API defaults.")
         elif safety_settings_dict and not SDK_AVAILABLE: log_warning("Safety settings provided but SDK unavailable.")
 
-        model_info = next((m for m in self.available_models_cache.get(api_key_name, []) if m['name'] == model_name), None)
+        model_info = next((m for m in self.get_cached_models(api_key_name) or [] if m['name'] == model_name), None)
         if model_info: likely_image_support = model_info.get('likely_image_support', False); log_debug(f"Image support from cache for {model_name}: {likely_image_support}")
         else: likely_image_support = ("image" in model_name.lower() or "vision" in model_name.lower() or "flash" in model_name.lower() or "pixel" in model_name.lower() or "imagen" in model_name.lower()); log_warning(f"Model info cache miss for '{model_name}'. Inferred image support: {likely_image_support}")
 
@@ -408,11 +471,22 @@ class GeminiHandler(QObject):
         try:
             log_info(f"Sending request to model '{model_name}' using client for key '{api_key_name}'...")
             # Pass the prepared api_contents (string or list with PIL Images) and config object
-            response = client.models.generate_content(
-                model=model_name,
-                contents=api_contents, # Pass the resolved content
-                config=generation_config_obj # Pass the config object (or None)
-            )
+            if text_chunk_callback is not None and generation_config_args.get('response_modalities') == ['TEXT']:
+                # Stream text-only responses so the caller can show text before the response completes
+                response = self._collect_text_stream(
+                    client.models.generate_content_stream(
+                        model=model_name,
+                        contents=api_contents,
+                        config=generation_config_obj
+                    ),
+                    text_chunk_callback
+                )
+            else:
+                response = client.models.generate_content(
+                    model=model_name,
+                    contents=api_contents, # Pass the resolved content
+                    config=generation_config_obj # Pass the config object (or None)
+                )
             log_info(f"API response received for key '{api_key_name}'.")
 
         # 5. Error Handling (Revised Order and Types, includes resolved prompt)
@@ -1,18 +1,41 @@
 # -*- coding: utf-8 -*-
 import secrets
 import base64
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import traceback
 from io import BytesIO
-from PyQt6.QtCore import pyqtSignal, QObject
-from utils.constants import PROMPTS_FILE, MAX_PROMPT_SLOTS, PROMPTS_ASSETS_DIR
+from PyQt6.QtCore import pyqtSignal, QObject, QRunnable, QThreadPool
+from utils.constants import PROMPTS_FILE, MAX_PROMPT_SLOTS, PROMPTS_ASSETS_DIR, PROMPT_THUMBNAIL_SIZE
 from utils.helpers import load_json_file, save_json_file
 from utils.logger import log_info, log_warning, log_error, log_debug
 from PIL import Image
 from core.image_processor import ImageProcessor
 from utils.logger import log_info, log_error, log_warning, log_debug
 
+_UNNUMBERED_SLOT_ORDER = 10**9 # Sorts keys that aren't "slot_<n>" after every numbered slot
+
+
+def _slot_sort_key(slot_key: str) -> int:
+    """Numeric sort key for "slot_<n>" keys."""
+    head, _, tail = slot_key.rpartition('_')
+    return int(tail) if head == "slot" and tail.isdigit() else _UNNUMBERED_SLOT_ORDER
+
+
+class _SavePromptsTask(QRunnable):
+    """Writes a snapshot of the prompts dictionary on a QThreadPool thread."""
+
+    def __init__(self, service: "PromptService", generation: int, snapshot: Dict[str, Dict[str, str]]):
+        super().__init__()
+        self.service = service
+        self.generation = generation
+        self.snapshot = snapshot
+
+    def run(self):
+        self.service._write_snapshot(self.generation, self.snapshot)
+
+
 class PromptService(QObject):
     prompts_updated = pyqtSignal()
     """Manages storage and retrieval of user prompts, including thumbnail paths."""
@@ -23,6 +46,11 @@ class PromptService(QObject):
         self.max_slots = max_slots
         # Structure: {"slot_1": {"name": "...", "text": "...", "thumbnail_path": "..."}, ...}
         self._prompts: Dict[str, Dict[str, str]] = self._load_prompts()
+        # Slot keys in numeric order; rebuilt lazily after a slot is added or removed
+        self._sorted_slot_keys: Optional[List[str]] = None
+        # Saves are numbered so a slower, older background write never lands after a newer one
+        self._save_lock = threading.Lock()
+        self._save_generation = 0
 
     def _load_prompts(self) -> Dict[str, Dict[str, str]]:
         """Loads prompts from the JSON file."""
@@ -46,13 +74,34 @@ class PromptService(QObject):
     # --- RENAMED FROM _save_prompts ---
     def save_all_prompts(self) -> bool:
         """Saves the current state of prompts to the JSON file."""
-        log_debug(f"Saving {len(self._prompts)} prompts to {self.filepath}")
-        success = save_json_file(self.filepath, self._prompts)
+        self._save_generation += 1
+        return self._write_snapshot(self._save_generation, self._prompts)
+    # --- END RENAMED METHOD ---
+
+    def save_all_prompts_async(self):
+        """
+        Like save_all_prompts, but the file is written on the global QThreadPool.
+        The prompts are snapshotted here (GUI thread), so later in-memory edits
+        never race the writer; prompts_updated is emitted when the write succeeds.
+        """
+        self._save_generation += 1
+        snapshot = {slot_key: dict(data) for slot_key, data in self._prompts.items()}
+        QThreadPool.globalInstance().start(_SavePromptsTask(self, self._save_generation, snapshot))
+
+    def _write_snapshot(self, generation: int, prompts: Dict[str, Dict[str, str]]) -> bool:
+        """Writes the given prompts unless a newer save was requested meanwhile (any thread)."""
+        with self._save_lock:
+            if generation != self._save_generation:
+                log_debug(f"Skipping prompt save #{generation}; save #{self._save_generation} supersedes it.")
+                return True
+            log_debug(f"Saving {len(prompts)} prompts to {self.filepath}")
+            success = save_json_file(self.filepath, prompts)
         if success:
             log_info("Prompt file saved successfully. Emitting prompts_updated signal.")
             self.prompts_updated.emit()
+        else:
+            log_error(f"Failed to write prompts file {self.filepath}.")
         return success
-    # --- END RENAMED METHOD ---
 
 
     def _get_next_available_slot(self) -> Optional[str]:
@@ -81,8 +130,8 @@ class PromptService(QObject):
             # Ensure assets directory exists
             PROMPTS_ASSETS_DIR.mkdir(parents=True, exist_ok=True)
 
-            # Generate thumbnail (use desired larger size)
-            thumb_bytes = ImageProcessor.create_thumbnail_bytes(image_bytes, size=(256, 256))
+            # Generate thumbnail at the size the Prompt Manager displays it
+            thumb_bytes = ImageProcessor.create_thumbnail_bytes(image_bytes, size=PROMPT_THUMBNAIL_SIZE)
 
             if thumb_bytes:
                 thumbnail_full_path.write_bytes(thumb_bytes)
@@ -100,14 +149,13 @@ class PromptService(QObject):
         """Deletes a thumbnail file from the assets directory if it exists."""
         if relative_thumb_filename:
             thumb_file_path = PROMPTS_ASSETS_DIR / relative_thumb_filename
-            if thumb_file_path.is_file():
-                try:
-                    thumb_file_path.unlink()
-                    log_info(f"Deleted thumbnail file: {thumb_file_path}")
-                except OSError as e:
-                    log_error(f"Error deleting thumbnail file {thumb_file_path}: {e}")
-            else:
+            try:
+                thumb_file_path.unlink() # No is_file() pre-check: a missing file surfaces as FileNotFoundError
+                log_info(f"Deleted thumbnail file: {thumb_file_path}")
+            except FileNotFoundError:
                 log_debug(f"Thumbnail file path found in data ('{relative_thumb_filename}'), but file doesn't exist at {thumb_file_path}, skipping deletion.")
+            except OSError as e:
+                log_error(f"Error deleting thumbnail file {thumb_file_path}: {e}")
 
     def add_prompt_to_memory(self, name: str, text: str) -> Optional[str]:
         """Adds a new prompt to the next available slot in memory. Returns slot_key."""
@@ -122,6 +170,7 @@ class PromptService(QObject):
 
         # Initialize with thumbnail_path as None
         self._prompts[slot_key] = {"name": name, "text": text, "thumbnail_path": None}
+        self._sorted_slot_keys = None
         log_info(f"Prompt '{name}' added to {slot_key} (in memory).")
         return slot_key
 
@@ -130,10 +179,15 @@ class PromptService(QObject):
         if slot_key not in self._prompts:
             log_error(f"Attempted to update non-existent prompt slot '{slot_key}'.")
             return False
+        return self._store_prompt_data(slot_key, name, text, thumbnail_path)
+
+    def _store_prompt_data(self, slot_key: str, name: str, text: str, thumbnail_path: Optional[str]) -> bool:
+        """Validates and stores the data of a slot already known to exist (no membership re-check)."""
         if not name: # Allow empty text, but not empty name
             log_error("Prompt name cannot be empty for update.")
             return False
 
+        # A fresh dict rather than in-place mutation: get_all_prompts_full() hands out shallow copies
         self._prompts[slot_key] = {
             "name": name,
             "text": text,
@@ -142,6 +196,17 @@ class PromptService(QObject):
         log_debug(f"Prompt data for {slot_key} updated in memory.")
         return True
 
+    def update_prompts_bulk(self, updates: Dict[str, Tuple[str, str, Optional[str]]]) -> List[str]:
+        """
+        Applies several (name, text, thumbnail_path) updates in memory in one call.
+        Slots no longer present (deleted meanwhile) are skipped. Does NOT save or emit.
+        Returns the slot keys whose update was rejected.
+        """
+        prompts = self._prompts
+        store = self._store_prompt_data
+        return [slot_key for slot_key, (name, text, thumbnail_path) in updates.items()
+                if slot_key in prompts and not store(slot_key, name, text, thumbnail_path)]
+
 
     # --- NEW Public Methods ---
 
@@ -234,20 +299,22 @@ class PromptService(QObject):
         if slot_key in self._prompts:
             removed_name = self._prompts[slot_key].get("name", "Unknown")
             del self._prompts[slot_key]
+            self._sorted_slot_keys = None
             log_info(f"Prompt '{removed_name}' ({slot_key}) removed from memory.")
             # Note: Deleting the thumbnail file on remove is handled in the PromptManagerDialog
             return True
         log_warning(f"Attempted to remove non-existent prompt slot '{slot_key}'.")
         return False
 
+    def get_sorted_slot_keys(self) -> List[str]:
+        """Returns the slot keys ordered by slot number (cached until a slot is added/removed)."""
+        if self._sorted_slot_keys is None:
+            self._sorted_slot_keys = sorted(self._prompts, key=_slot_sort_key)
+        return list(self._sorted_slot_keys)
+
     def get_all_prompts_summary(self) -> List[Tuple[str, str]]:
         """Returns a list of (slot_key, prompt_name) for UI lists, sorted by slot number."""
-        summaries = []
-        for slot_key, data in self._prompts.items():
-            summaries.append((slot_key, data.get("name", "Unnamed Prompt")))
-
-        summaries.sort(key=lambda item: int(item[0].split('_')[-1]) if item[0].startswith("slot_") else float('inf'))
-        return summaries
+        return [(slot_key, self._prompts[slot_key].get("name", "Unnamed Prompt")) for slot_key in self.get_sorted_slot_keys()]
 
     def get_all_prompts_full(self) -> Dict[str, Dict[str, str]]:
         """Returns a copy of the full prompts dictionary."""
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
 from utils import constants
 # Need to import SDK types here for safety setting serialization/deserialization
 try:
@@ -36,6 +36,13 @@ from utils.constants import (
 from utils.helpers import load_json_file, save_json_file
 from utils.logger import log_info, log_error, log_warning, set_logging_enabled, is_logging_enabled
 
+_MODE_SAFETY_SETTINGS_KEYS = frozenset(("single_mode_safety_settings", "multi_mode_safety_settings"))
+
+
+def _is_safety_settings_key(key: str) -> bool:
+    """True for keys whose stored value is a serialized safety settings dict."""
+    return key in _MODE_SAFETY_SETTINGS_KEYS or (key.startswith("instance_") and key.endswith("_safety_settings"))
+
 
 class SettingsService:
     """Manages application settings."""
@@ -43,6 +50,9 @@ class SettingsService:
     def __init__(self, filepath: Path = SETTINGS_FILE):
         self.filepath = filepath
         self.settings: Dict[str, Any] = self._load_settings()
+        # Bumped on every change to the saved filename patterns, so UIs can skip unchanged reloads
+        self.patterns_version: int = 0
+        self._sorted_pattern_names: Optional[Tuple[int, List[str]]] = None # (patterns_version, names)
         # Apply loaded logging setting immediately
         set_logging_enabled(self.get_setting("logging_enabled", DEFAULT_LOGGING_ENABLED))
 
@@ -198,6 +208,12 @@ class SettingsService:
             return {DEFAULT_FILENAME_PATTERN_NAME: DEFAULT_FILENAME_PATTERN}.copy()
         return patterns.copy()
 
+    def get_sorted_pattern_names(self) -> List[str]:
+        """Returns the saved pattern names in sorted order (re-sorted only after the patterns change)."""
+        if self._sorted_pattern_names is None or self._sorted_pattern_names[0] != self.patterns_version:
+            self._sorted_pattern_names = (self.patterns_version, sorted(self.get_saved_filename_patterns()))
+        return list(self._sorted_pattern_names[1])
+
     def add_or_update_saved_filename_pattern(self, name: str, pattern: str) -> bool:
         """Adds or updates a pattern in the saved patterns list."""
         if not name or not pattern:
@@ -213,6 +229,7 @@ class SettingsService:
 
         current_patterns[name] = pattern
         self.settings[SAVED_FILENAME_PATTERNS_KEY] = current_patterns # Update the main settings dict
+        self.patterns_version += 1
         log_info(f"Saved filename pattern '{name}' updated.")
         return self._save_settings()
 
@@ -235,6 +252,7 @@ class SettingsService:
                 self.set_setting(ACTIVE_FILENAME_PATTERN_NAME_KEY, DEFAULT_FILENAME_PATTERN_NAME, save=False) # Update active name and pattern string, don't save yet
 
             self.settings[SAVED_FILENAME_PATTERNS_KEY] = current_patterns
+            self.patterns_version += 1
             log_info(f"Saved filename pattern '{name}' removed.")
             return self._save_settings() # Now save all changes
         else:
@@ -261,12 +279,11 @@ class SettingsService:
         """Retrieves a setting value by key, deserializing safety settings if needed."""
         raw_value = self.settings.get(key, default)
 
-        # Check if the key represents safety settings that need deserialization
-        is_single_safety = (key == "single_mode_safety_settings")
-        is_multi_safety = (key == "multi_mode_safety_settings")
-        is_instance_safety = key.startswith("instance_") and key.endswith("_safety_settings")
+        # Fast path: unset values and ordinary (non-safety) keys are returned as stored
+        if raw_value is None or not _is_safety_settings_key(key):
+            return raw_value
 
-        if (is_single_safety or is_multi_safety or is_instance_safety) and isinstance(raw_value, dict):
+        if isinstance(raw_value, dict):
             # Attempt to deserialize only if it looks like a serialized dict
             deserialized_value = self._deserialize_safety_settings(raw_value)
             if deserialized_value is not None:
@@ -276,12 +293,8 @@ class SettingsService:
                 # Deserialization failed or resulted in None, return original raw_value or default
                 log_warning(f"Failed to deserialize safety setting for key '{key}', returning raw value or default.")
                 return raw_value
-        elif (is_single_safety or is_multi_safety or is_instance_safety) and raw_value is not None and not isinstance(raw_value, dict):
-             # Log if the value exists but isn't the expected dictionary format
-             log_warning(f"Safety setting key '{key}' exists but is not a dictionary (Type: {type(raw_value)}). Returning raw value.")
-             return raw_value
-
-        # For all other keys, or if safety setting is None/not a dict, return the raw value
+        # Log if the value exists but isn't the expected dictionary format
+        log_warning(f"Safety setting key '{key}' exists but is not a dictionary (Type: {type(raw_value)}). Returning raw value.")
         return raw_value
 
     def set_setting(self, key: str, value: Any, save: bool = True):
@@ -306,9 +319,17 @@ class SettingsService:
         else:
             # Store other settings normally
             self.settings[key] = value
+            if key == SAVED_FILENAME_PATTERNS_KEY:
+                self.patterns_version += 1
         if save:
             self._save_settings()
 
+    def set_settings(self, values: Dict[str, Any], save: bool = True) -> bool:
+        """Sets several settings (same per-key handling as set_setting) and saves the file once."""
+        for key, value in values.items():
+            self.set_setting(key, value, save=False)
+        return self._save_settings() if save else True
+
     def get_all_settings(self) -> Dict[str, Any]:
         """Returns a copy of all current settings."""
         # Return a copy to prevent external modification
@@ -2,12 +2,34 @@
 import os
 import re
 import random
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Set, Any
+from typing import List, Dict, Optional, Tuple, Set, Any, Union
 import json
 from utils.constants import WILDCARDS_DIR, WILDCARD_REGEX
 from utils.logger import log_error, log_warning, log_debug, log_info
 
+_WILDCARD_PATTERN = re.compile(WILDCARD_REGEX)
+
+
+@lru_cache(maxsize=256)
+def _parse_wildcard_tokens(text: str) -> Tuple[Union[str, re.Match], ...]:
+    """
+    Splits text into literal strings and wildcard matches.
+    Only the parse is cached; the values chosen for each match stay random per resolve.
+    """
+    tokens: List[Union[str, re.Match]] = []
+    pos = 0
+    for match in _WILDCARD_PATTERN.finditer(text):
+        if match.start() > pos:
+            tokens.append(text[pos:match.start()])
+        tokens.append(match)
+        pos = match.end()
+    if pos < len(text):
+        tokens.append(text[pos:])
+    return tuple(tokens)
+
+
 class WildcardResolver:
     """Handles resolving wildcards like [wildcard] and {wildcard} in prompts."""
 
@@ -98,7 +120,7 @@ class WildcardResolver:
         if not prompt_text:
             return None
 
-        matches = list(re.finditer(WILDCARD_REGEX, prompt_text))
+        matches = [token for token in _parse_wildcard_tokens(prompt_text) if not isinstance(token, str)]
 
         if index > len(matches):
             log_warning(f"Requested wildcard index {index}, but only found {len(matches)} wildcards in prompt.")
@@ -251,7 +273,7 @@ class WildcardResolver:
             log_debug("Match was not a curly or bracket wildcard. Returning original.")
             return original_match_text
 
-        if re.search(WILDCARD_REGEX, resolved_value):
+        if _WILDCARD_PATTERN.search(resolved_value):
             recursion_key = wildcard_base_name
             if recursion_key in visited_in_chain:
                 log_warning(f"Detected direct self-recursion for '{recursion_key}'. Stopping resolution for this part.")
@@ -287,20 +309,18 @@ class WildcardResolver:
         # Use a flag to check if any resolution happened in this pass
         changed_in_pass = False
 
-        # Define the replacement function which calls _resolve_single_wildcard
-        def replace_match(match_obj):
+        # Perform one full pass over the (cached) token list, resolving each wildcard match
+        resolved_parts = []
+        for token in _parse_wildcard_tokens(text):
+            if isinstance(token, str):
+                resolved_parts.append(token)
+                continue
             # Pass visited_in_chain AND target_map to the single wildcard resolver
-            resolved_part = self._resolve_single_wildcard(match_obj, current_depth, visited_in_chain, target_map)
-
-            # Check if the match actually resulted in a change
-            if resolved_part != match_obj.group(0):
-                nonlocal changed_in_pass # Modify the flag in the outer scope
+            resolved_part = self._resolve_single_wildcard(token, current_depth, visited_in_chain, target_map)
+            if resolved_part != token.group(0):
                 changed_in_pass = True
-
-            return resolved_part
-
-        # Perform one full pass of substitution using re.sub
-        resolved_text_this_pass = re.sub(WILDCARD_REGEX, replace_match, text)
+            resolved_parts.append(resolved_part)
+        resolved_text_this_pass = "".join(resolved_parts)
 
         # If any wildcard was resolved in this pass and the string changed, recursively call again
         if changed_in_pass and resolved_text_this_pass != text:
@@ -389,7 +409,7 @@ class WildcardResolver:
 
         for original_wildcard_text, chosen_value in chosen_wildcards.items():
             # Extract wildcard_name from the original text (e.g., 'colors' from '[colors]' or '{colors}')
-            match = re.match(WILDCARD_REGEX, original_wildcard_text) # Match against original text
+            match = _WILDCARD_PATTERN.match(original_wildcard_text) # Match against original text
             if not match:
                 log_warning(f"Could not parse wildcard name from original text: {original_wildcard_text}")
                 continue
@@ -6,6 +6,7 @@ from pathlib import Path
 # --- PyQt Imports ---
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import QCoreApplication, QSettings
+from PyQt6.QtGui import QPixmapCache
 
 # --- Project Imports ---
 # Initialize directories first
@@ -34,6 +35,7 @@ def main():
     QCoreApplication.setApplicationName("Gemini Studio UI")
 
     app = QApplication(sys.argv)
+    QPixmapCache.setCacheLimit(constants.PIXMAP_CACHE_LIMIT_KB) # Shared, size-bounded thumbnail cache
 
     log_info("-" * 30)
     log_info(f"Starting {QCoreApplication.applicationName()}...")
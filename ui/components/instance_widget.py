@@ -100,6 +100,7 @@ class InstanceWidget(QWidget):
     generation_started = pyqtSignal(int) # instance_id
     generation_finished = pyqtSignal(int) # instance_id
     request_new_key = pyqtSignal(int) # instance_id
+    loop_state_changed = pyqtSignal(int, bool) # instance_id, is_looping
     INSTANCE_WIDGET_FIXED_HEIGHT = 720
 
 
@@ -121,7 +122,7 @@ class InstanceWidget(QWidget):
         self.gemini_handler = gemini_handler # Shared instance
 
         self._is_running = False # Internal state for worker activity
-        self._continuous_loop_active = False # Flag for user intent to loop
+        self._loop_active_flag = False # Backing field for _continuous_loop_active
         self._auto_save_enabled = False
         self._current_api_key_name: Optional[str] = None
         self._current_api_key_value: Optional[str] = None # Store actual key value
@@ -137,9 +138,10 @@ class InstanceWidget(QWidget):
         self._last_image_bytes: Optional[bytes] = None
         self._last_image_mime: Optional[str] = None
 
+        # Started by _ensure_worker_thread on this instance's first generation,
+        # so idle instances don't each hold an OS thread
         self._worker_thread = QThread(self)
         self._worker_thread.setObjectName(f"WorkerThread_{self.instance_id}")
-        self._worker_thread.start() 
         self._generation_worker: Optional[GenerationWorker] = None
         
         
@@ -454,6 +456,17 @@ class InstanceWidget(QWidget):
     def get_instance_id(self) -> int:
         return self.instance_id
 
+    @property
+    def _continuous_loop_active(self) -> bool:
+        """Flag for user intent to loop. Emits loop_state_changed whenever it flips."""
+        return self._loop_active_flag
+
+    @_continuous_loop_active.setter
+    def _continuous_loop_active(self, active: bool):
+        if active != self._loop_active_flag:
+            self._loop_active_flag = active
+            self.loop_state_changed.emit(self.instance_id, active)
+
     def is_running(self) -> bool:
         # Crucial method for MultiModeWidget
         return self._is_running
@@ -811,7 +824,7 @@ class InstanceWidget(QWidget):
         # Get full prompt data including thumbnail paths
         prompts_data = self.prompt_service.get_all_prompts_full()
         # Sort slots numerically for consistent order
-        sorted_slots = sorted(prompts_data.keys(), key=lambda k: int(k.split('_')[-1]) if k.startswith("slot_") else float('inf'))
+        sorted_slots = self.prompt_service.get_sorted_slot_keys()
 
         item_found = False
         index_to_select = 0 # Default to placeholder
@@ -1042,7 +1055,7 @@ class InstanceWidget(QWidget):
         if selected_key_name == self._current_api_key_name and self.gemini_handler.is_client_available(selected_key_name):
              log_debug(f"Instance {self.instance_id}: Same API key '{selected_key_name}' re-selected and client available.")
              # Check cache - if models exist, populate immediately. If not, defer loading anyway.
-             cached_models = self.gemini_handler.available_models_cache.get(selected_key_name)
+             cached_models = self.gemini_handler.get_cached_models(selected_key_name)
              if cached_models:
                   log_debug(f"Instance {self.instance_id}: Populating models from cache for re-selected key.")
                   self._populate_model_combo_instance(cached_models)
@@ -1109,7 +1122,7 @@ class InstanceWidget(QWidget):
             QApplication.processEvents() # Ensure UI updates
 
             # Check cache before triggering API load
-            cached_models = self.gemini_handler.available_models_cache.get(api_key_name)
+            cached_models = self.gemini_handler.get_cached_models(api_key_name)
             if cached_models:
                  log_info(f"{instance_log_prefix}: Using cached models for key: {api_key_name}")
                  self._populate_model_combo_instance(cached_models)
@@ -1213,7 +1226,7 @@ class InstanceWidget(QWidget):
         self._set_ui_ready(True) # Enable generation if model is selected
 
         # Get the list of models specifically for the current instance's API key
-        models_for_current_key = self.gemini_handler.available_models_cache.get(self._current_api_key_name, [])
+        models_for_current_key = self.gemini_handler.get_cached_models(self._current_api_key_name) or []
         # Now iterate through the correct list
         model_info = next((m for m in models_for_current_key if m['name'] == model_name), None)
         supports_images = model_info.get('likely_image_support', False) if model_info else False
@@ -1708,6 +1721,14 @@ class InstanceWidget(QWidget):
         self.save_prompt_button.setVisible(False) # Hide save button after action
 
 
+    def _ensure_worker_thread(self) -> bool:
+        """Starts this instance's worker thread event loop if needed; returns whether it is running."""
+        if getattr(self, '_worker_thread', None) is None:
+            return False
+        if not self._worker_thread.isRunning():
+            self._worker_thread.start()
+            log_debug(f"Instance {self.instance_id}: Worker thread started.")
+        return self._worker_thread.isRunning()
 
 
     def start_generation(self):
@@ -1761,7 +1782,7 @@ class InstanceWidget(QWidget):
               log_error(f"{instance_log_prefix}: Wildcard resolution error: {wc_err}", exc_info=True); self._set_ui_generating(False); self._update_button_style(); show_error_message(self, "Wildcard Error", f"Wildcard resolution failed: {wc_err}"); return
 
          # --- Validate Image Support & Prepare Images ---
-         models_for_current_key = self.gemini_handler.available_models_cache.get(api_key_name, [])
+         models_for_current_key = self.gemini_handler.get_cached_models(api_key_name) or []
          model_info = next((m for m in models_for_current_key if m['name'] == model_name), None)
          supports_images = model_info.get('likely_image_support', False) if model_info else False
          image_list_for_worker = []; current_image_for_context = None
@@ -1813,7 +1834,7 @@ class InstanceWidget(QWidget):
              "request_timeout": None,
              "retry_count": self.settings_service.get_setting("retry_count", constants.DEFAULT_RETRY_COUNT),
              "retry_delay": self.settings_service.get_setting("retry_delay", constants.DEFAULT_RETRY_DELAY),
-             **filename_wildcard_values
+             # filename_wildcard_values are passed explicitly to the worker, not merged in here
          }
          log_info(f"[{instance_log_prefix} PRE-WORKER INIT] Passing explicit resolved_map_copy")
 
@@ -1828,7 +1849,7 @@ class InstanceWidget(QWidget):
          # --- Create Worker and Move to Thread ---
          log_debug(f"{instance_log_prefix}: Creating GenerationWorker...")
          _image_filename_context = current_image_for_context.name if current_image_for_context else None
-         if not hasattr(self, '_worker_thread') or self._worker_thread is None or not self._worker_thread.isRunning():
+         if not self._ensure_worker_thread():
              log_critical(f"{instance_log_prefix}: Worker thread error!"); self._continuous_loop_active = False; self._set_ui_generating(False); self._update_button_style(); self._update_status_label("Internal Error: Thread."); return
 
          self._generation_worker = GenerationWorker(
@@ -1837,6 +1858,7 @@ class InstanceWidget(QWidget):
              params=gen_params, # Pass other params
              resolved_wildcards_map=resolved_map_copy, # <<< PASS EXPLICITLY
              image_filename_context=_image_filename_context,
+             filename_wildcard_values=filename_wildcard_values,
          )
          self._generation_worker.moveToThread(self._worker_thread)
 
@@ -1911,6 +1933,10 @@ class InstanceWidget(QWidget):
         """Returns True if the instance is set to loop continuously."""
         return self._continuous_loop_active
 
+    def is_active(self) -> bool:
+        """Returns True if the instance is running or looping (i.e. not idle)."""
+        return self._is_running or self._loop_active_flag
+
 
     def stop_generation(self):
          """
@@ -1960,6 +1986,9 @@ class InstanceWidget(QWidget):
               self._is_running = False
               self._continuous_loop_active = False # Stop loop if state is inconsistent
               self._set_ui_generating(False) # Reset UI
+              # No worker will report back, so announce the stop here; MultiModeWidget's
+              # running-ID index would otherwise keep this (non-looping) instance
+              self.generation_finished.emit(self.instance_id)
          else:
              log_debug(f"{instance_id_str}: Stop requested but worker not running.")
              # If stop is called when idle, ensure loop is off and UI is idle
@@ -2001,7 +2030,7 @@ class InstanceWidget(QWidget):
              image_bytes = result.get("image_bytes"); image_mime = result.get("image_mime")
              text_result = result.get("text_result", "")
              image_filename_context = result.get("image_filename_context")
-             filename_wildcard_values = { k: v for k, v in result.items() if k.startswith("wildcard_value_") }
+             filename_wildcard_values = result.get("filename_wildcard_values", {})
              log_debug(f"{instance_log_prefix}: Received pre-resolved filename wildcard values: {filename_wildcard_values}")
 
 
@@ -2244,7 +2273,7 @@ class InstanceWidget(QWidget):
          if not disable_config_general and self.model_combo.isEnabled():
               model_name = self.model_combo.itemData(self.model_combo.currentIndex())
               if model_name and self._current_api_key_name:
-                    models_for_current_key = self.gemini_handler.available_models_cache.get(self._current_api_key_name, [])
+                    models_for_current_key = self.gemini_handler.get_cached_models(self._current_api_key_name) or []
                     model_info = next((m for m in models_for_current_key if m['name'] == model_name), None)
                     model_supports_images = model_info.get('likely_image_support', False) if model_info else False
          self.add_image_button.setEnabled(not disable_config_general and model_supports_images)
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import webbrowser 
 from pathlib import Path
+from typing import Optional
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QStackedWidget, QMenuBar, QStatusBar,
     QFileDialog, QApplication, QSplitter
@@ -47,6 +48,7 @@ class MainWindow(QMainWindow):
         self.prompt_service = prompt_service
         self.wildcard_resolver = wildcard_resolver
         self.gemini_handler = gemini_handler
+        self._prompt_manager_dialog: Optional[PromptManagerDialog] = None # Built on first open, then reused
 
         self._setup_ui()
         self._connect_signals()
@@ -383,42 +385,25 @@ class MainWindow(QMainWindow):
         else:
             log_debug("Launching prompt manager from Single-Mode.")
 
-        # Instantiate the dialog
-        dialog = PromptManagerDialog(
-            prompt_service=self.prompt_service,
-            wildcard_resolver=self.wildcard_resolver,
-            settings_service=self.settings_service,
-            current_mode=mode,
-            multi_mode_instance_data=instance_data,
-            parent=self
-        )
-
-        # --- Connect Prompt Service Signal TO the Dialog ---
-        connected_slot = None # Keep track of the connected slot
-        if hasattr(self.prompt_service, 'prompts_updated') and hasattr(dialog, '_handle_external_prompt_update'):
-            try:
-                connected_slot = dialog._handle_external_prompt_update
-                self.prompt_service.prompts_updated.connect(connected_slot)
-                log_debug("Connected prompt_service.prompts_updated to PromptManagerDialog._handle_external_prompt_update.")
-            except (TypeError, AttributeError) as e:
-                 log_warning(f"Failed to connect prompts_updated signal to dialog: {e}")
-                 connected_slot = None # Ensure it's None if connection failed
+        # Instantiate the dialog once; later opens only refresh its prompt list and target
+        dialog = self._prompt_manager_dialog
+        if dialog is None:
+            dialog = PromptManagerDialog(
+                prompt_service=self.prompt_service,
+                wildcard_resolver=self.wildcard_resolver,
+                settings_service=self.settings_service,
+                current_mode=mode,
+                multi_mode_instance_data=instance_data,
+                parent=self
+            )
+            self._prompt_manager_dialog = dialog
         else:
-            log_warning("PromptService signal or dialog slot missing for real-time updates.")
-        # --- End Connect ---
+            dialog.prepare_for_open(mode, instance_data)
 
-        # Execute the dialog (blocks here)
+        # Execute the dialog (blocks here). The dialog listens to prompt_service.prompts_updated
+        # itself while shown and drops the connection when it finishes.
         result = dialog.exec()
 
-        # --- Disconnect Signal FROM the Dialog ---
-        if connected_slot:
-            try:
-                self.prompt_service.prompts_updated.disconnect(connected_slot)
-                log_debug("Disconnected prompt_service.prompts_updated from PromptManagerDialog.")
-            except (TypeError, RuntimeError) as e:
-                log_warning(f"Error disconnecting prompt service signal from PromptManagerDialog: {e}")
-        # --- End Disconnect ---
-
         # --- Handle Results (Load Prompt) ---
         if result == PromptManagerDialog.Accepted:
             selected_prompt_text, load_target = dialog.get_load_data()
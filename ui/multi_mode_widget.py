@@ -1,19 +1,21 @@
 # -*- coding: utf-8 -*-
 
-import time
 import random
-from typing import Dict, Optional, List, Tuple
+import weakref
+from collections import deque
+from functools import partial
+from typing import Deque, Dict, Optional, List, Set, Tuple
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QScrollArea, QPushButton, QHBoxLayout, QGroupBox,
     QMessageBox, QApplication, QCheckBox
 )
-from PyQt6.QtCore import pyqtSignal, Qt, QTimer, pyqtSlot # Import QTimer
+from PyQt6.QtCore import pyqtSignal, Qt, QTimer, pyqtSlot, QCoreApplication, QEventLoop
 
 # --- Project Imports ---
 from utils import constants
 from utils.logger import log_info, log_debug, log_error, log_warning
-from utils.helpers import show_info_message, show_error_message
+from utils.helpers import show_info_message, show_error_message, show_warning_message
 from core.settings_service import SettingsService
 from core.api_key_service import ApiKeyService
 from core.prompt_service import PromptService
@@ -46,9 +48,25 @@ class MultiModeWidget(QWidget):
         self._assigned_keys: Dict[int, str] = {}
         self._next_instance_id = 1
         self._active_generations = 0 # Count how many instances are running
+        # Activity indices kept in sync from instance signals (avoids rescanning every widget)
+        self._running_ids: Set[int] = set()
+        self._looping_ids: Set[int] = set()
         self._scroll_timer = QTimer(self) 
         self._scroll_timer.setSingleShot(True)
         self._scroll_timer.setInterval(250)
+        # Staggered "Start All" uses one repeating timer draining a queue of instances
+        # Weak references so a removed instance isn't kept alive by a pending start/reset
+        self._pending_starts: Deque["weakref.ref[InstanceWidget]"] = deque()
+        self._start_timer = QTimer(self)
+        self._start_timer.setSingleShot(False)
+        self._start_timer.setTimerType(Qt.TimerType.CoarseTimer)
+        # "Results cleared." -> "Ready." resets share one coarse single-shot timer
+        self._status_reset_queue: List["weakref.ref[InstanceWidget]"] = []
+        self._status_reset_timer = QTimer(self)
+        self._status_reset_timer.setSingleShot(True)
+        self._status_reset_timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self._status_reset_timer.setInterval(2000)
+        self._confirm_clear_box: Optional[QMessageBox] = None # Built on first "Clear All Results"
 
         self._setup_ui()
         self._connect_signals()
@@ -139,10 +157,12 @@ class MultiModeWidget(QWidget):
              log_debug("Skipping thumbnail update, window is minimized.")
              return
 
-        viewport_rect = self.scroll_area.viewport().rect()
-        for instance_widget in self._instance_widgets.values():
+        widgets = self._instance_widgets
+        viewport = self.scroll_area.viewport()
+        viewport_rect = viewport.rect()
+        for instance_widget in widgets.values():
             # Map instance position relative to the viewport
-            instance_pos_in_viewport = instance_widget.mapTo(self.scroll_area.viewport(), instance_widget.rect().topLeft())
+            instance_pos_in_viewport = instance_widget.mapTo(viewport, instance_widget.rect().topLeft())
             instance_rect_in_viewport = instance_widget.rect().translated(instance_pos_in_viewport)
 
             is_visible = viewport_rect.intersects(instance_rect_in_viewport)
@@ -158,7 +178,7 @@ class MultiModeWidget(QWidget):
                 instance_widget.clear_thumbnail()
         else:
             # Window restored, trigger check after a short delay for layout settling
-            QTimer.singleShot(100, self._update_visible_thumbnails)    
+            QTimer.singleShot(100, Qt.TimerType.CoarseTimer, self._update_visible_thumbnails)
 
     
     
@@ -170,6 +190,8 @@ class MultiModeWidget(QWidget):
         self.clear_all_results_button.clicked.connect(self._clear_all_results)
         self.scroll_area.verticalScrollBar().valueChanged.connect(self._on_scroll) 
         self._scroll_timer.timeout.connect(self._update_visible_thumbnails)
+        self._start_timer.timeout.connect(self._start_next_pending_instance)
+        self._status_reset_timer.timeout.connect(self._drain_status_reset_queue)
         self.global_continuous_checkbox.toggled.connect(self._toggle_all_continuous)
         self.global_autosave_checkbox.toggled.connect(self._toggle_all_autosave)
         
@@ -182,6 +204,7 @@ class MultiModeWidget(QWidget):
          # We can use the start/stop button toggle signal for simplicity
          instance.generation_started.connect(self._on_instance_started)
          instance.generation_finished.connect(self._on_instance_finished)
+         instance.loop_state_changed.connect(self._on_instance_loop_changed)
          instance.request_new_key.connect(self._handle_key_request)
 
     def get_instance_summary_for_dialog(self) -> List[Tuple[int, str, str, str]]:
@@ -271,7 +294,8 @@ class MultiModeWidget(QWidget):
     def _toggle_all_continuous(self, checked):
         """Sets the continuous mode for all instances."""
         log_info(f"Setting continuous mode for all instances to: {checked}")
-        for instance in self._instance_widgets.values():
+        widgets = self._instance_widgets
+        for instance in widgets.values():
             instance.set_continuous(checked) # Call instance method
 
     @pyqtSlot(bool)
@@ -287,24 +311,47 @@ class MultiModeWidget(QWidget):
     def _on_instance_started(self, instance_id):
         """Slot called when an instance starts generating."""
         log_debug(f"Instance {instance_id} reported started.")
-        # Simple recount is easiest way to ensure accuracy
-        self._active_generations = sum(1 for w in self._instance_widgets.values() if w.is_running())
+        self._refresh_instance_activity(instance_id)
         self._update_action_button_states()
 
     @pyqtSlot(int)
     def _on_instance_finished(self, instance_id):
         """Slot called when an instance finishes generating."""
         log_debug(f"Instance {instance_id} reported finished.")
-        # Simple recount is easiest way to ensure accuracy
-        self._active_generations = sum(1 for w in self._instance_widgets.values() if w.is_running())
+        self._refresh_instance_activity(instance_id)
+        self._update_action_button_states()
+
+    @pyqtSlot(int, bool)
+    def _on_instance_loop_changed(self, instance_id, is_looping):
+        """Slot called when an instance's continuous-loop flag flips."""
+        log_debug(f"Instance {instance_id} reported looping={is_looping}.")
+        self._refresh_instance_activity(instance_id)
         self._update_action_button_states()
 
+    def _refresh_instance_activity(self, instance_id: int):
+        """Re-reads one instance's running/looping state into the activity indices."""
+        instance_widget = self._instance_widgets.get(instance_id)
+        if instance_widget is not None and instance_widget.is_running():
+            self._running_ids.add(instance_id)
+        else:
+            self._running_ids.discard(instance_id)
+        if instance_widget is not None and instance_widget.is_looping():
+            self._looping_ids.add(instance_id)
+        else:
+            self._looping_ids.discard(instance_id)
+        self._active_generations = len(self._running_ids)
+
+    def _active_instance_ids(self) -> Set[int]:
+        """IDs of instances that are running or looping."""
+        return self._running_ids | self._looping_ids
+
 
     def _update_action_button_states(self):
         """Enable/disable Start/Stop/Clear All buttons based on instance running AND looping states."""
+        active_count = len(self._active_instance_ids())
         has_instances = bool(self._instance_widgets)
-        any_active = any(w.is_running() or w.is_looping() for w in self._instance_widgets.values())
-        any_idle = any(not w.is_running() and not w.is_looping() for w in self._instance_widgets.values())
+        any_active = active_count > 0
+        any_idle = active_count < len(self._instance_widgets)
 
         # Start All: Enabled if instances exist AND at least one is truly idle
         self.start_all_button.setEnabled(has_instances and any_idle)
@@ -326,7 +373,7 @@ class MultiModeWidget(QWidget):
         instance_log_prefix = "MultiModeWidget" # For logging clarity
         log_info(f"{instance_log_prefix}: Shutdown requested (is_closing={is_closing}).")
 
-        running_instances = [id for id, w in self._instance_widgets.items() if w.is_running() or w.is_looping()]
+        running_instances = sorted(self._active_instance_ids())
 
         if running_instances and not is_closing:
             # If just switching modes, prevent if busy
@@ -428,7 +475,7 @@ class MultiModeWidget(QWidget):
                     instance_widget.load_prompt(prompt_text)
                     log_info(f"Loaded prompt into Multi Mode instance: {target_id}")
                     # Scroll to the instance?
-                    QTimer.singleShot(100, lambda: self.scroll_area.ensureWidgetVisible(instance_widget))
+                    QTimer.singleShot(100, Qt.TimerType.CoarseTimer, partial(self.scroll_area.ensureWidgetVisible, instance_widget))
                 else:
                     log_warning(f"Target instance ID '{target_id}' not found.")
                     show_info_message(self.parent(), "Load Failed", f"Could not find target instance ID: {target_id}")
@@ -478,16 +525,14 @@ class MultiModeWidget(QWidget):
 
         all_keys = self.api_key_service.get_key_names()
         used_keys = set(self._assigned_keys.values())
-        available_keys = [key for key in all_keys if key not in used_keys]
+        # Only the first unused key is needed, so stop scanning as soon as one is found
+        assigned_key_name = next((key for key in all_keys if key not in used_keys), None)
 
-        assigned_key_name = None
-        if available_keys:
-            assigned_key_name = available_keys[0]
-            log_info(f"Found unused API key '{assigned_key_name}' for new instance {instance_id}.")
-        else:
+        if assigned_key_name is None:
             log_warning("No unused API keys available to assign to new instance.")
             show_warning_message(self, "Cannot Add Instance", "All available API keys are currently assigned to other instances.")
             return
+        log_info(f"Found unused API key '{assigned_key_name}' for new instance {instance_id}.")
 
         log_info(f"Assigning API key '{assigned_key_name}' to instance {instance_id}.")
         self._assigned_keys[instance_id] = assigned_key_name
@@ -512,8 +557,8 @@ class MultiModeWidget(QWidget):
             self.placeholder_label.hide()
 
         self._update_action_button_states()
-        QTimer.singleShot(100, lambda: self.scroll_area.ensureWidgetVisible(instance_widget))
-        QTimer.singleShot(100, self._update_visible_thumbnails)
+        QTimer.singleShot(100, Qt.TimerType.CoarseTimer, partial(self.scroll_area.ensureWidgetVisible, instance_widget))
+        QTimer.singleShot(100, Qt.TimerType.CoarseTimer, self._update_visible_thumbnails)
 
 
     @pyqtSlot(int)
@@ -531,6 +576,15 @@ class MultiModeWidget(QWidget):
 
         log_info(f"Removing instance ID: {instance_id}")
 
+        # Drop any staggered start still queued for this instance
+        widget_ref = weakref.ref(instance_widget)
+        if widget_ref in self._pending_starts:
+            self._pending_starts.remove(widget_ref)
+            if not self._pending_starts:
+                self._start_timer.stop()
+        if widget_ref in self._status_reset_queue:
+            self._status_reset_queue.remove(widget_ref)
+
         # Disconnect signals? Usually handled by Qt's parent/child mechanism + deleteLater
         # instance_widget.request_delete.disconnect(self._remove_instance)
         # instance_widget.status_update.disconnect(self.status_update)
@@ -547,6 +601,7 @@ class MultiModeWidget(QWidget):
         # Remove from layout and dictionary (existing code)
         self.instance_layout.removeWidget(instance_widget)
         del self._instance_widgets[instance_id]
+        self._refresh_instance_activity(instance_id)
         instance_widget.deleteLater()
 
         # Show placeholder if no instances left
@@ -554,7 +609,7 @@ class MultiModeWidget(QWidget):
             self.placeholder_label.show()
 
         self._update_action_button_states()
-        QTimer.singleShot(100, self._update_visible_thumbnails)
+        QTimer.singleShot(100, Qt.TimerType.CoarseTimer, self._update_visible_thumbnails)
 
 
 
@@ -568,11 +623,8 @@ class MultiModeWidget(QWidget):
         instance_log_prefix = "MultiModeWidget" # For logging clarity
 
         # --- Identify Idle Instances ---
-        instances_to_start = []
-        for instance_widget in self._instance_widgets.values():
-            # Check if the instance is neither running nor set to loop continuously
-            if not instance_widget.is_running() and not instance_widget.is_looping():
-                instances_to_start.append(instance_widget)
+        active_ids = self._active_instance_ids()
+        instances_to_start = [w for i, w in self._instance_widgets.items() if i not in active_ids]
 
         if not instances_to_start:
             log_info("No instances were ready (idle and not looping) to start.")
@@ -586,13 +638,17 @@ class MultiModeWidget(QWidget):
         stagger_delay_ms = max(50, int(request_delay_setting_sec * 1000)) # Use at least 50ms between starts
         log_info(f"Starting {len(instances_to_start)} idle instance(s) with a stagger delay of {stagger_delay_ms}ms between each.")
 
-        # Schedule the start for each instance with increasing delay
-        for i, instance_widget in enumerate(instances_to_start):
-            instance_id = instance_widget.get_instance_id()
-            scheduled_delay = i * stagger_delay_ms
-            log_debug(f"Scheduling start for Instance {instance_id} in {scheduled_delay}ms.")
-            # Use lambda to capture the correct instance_widget for the timer's slot
-            QTimer.singleShot(scheduled_delay, lambda widget=instance_widget: self._safely_start_instance(widget))
+        # Queue the instances; the first starts now, the rest one per timer tick.
+        # If a stagger is already under way (queue non-empty, or the timer still in the
+        # cool-down tick after its last start), only enqueue so the spacing is kept.
+        stagger_idle = not self._pending_starts and not self._start_timer.isActive()
+        for widget_ref in map(weakref.ref, instances_to_start):
+            if widget_ref not in self._pending_starts:
+                self._pending_starts.append(widget_ref)
+        log_debug(f"Queued {len(self._pending_starts)} instance(s) for staggered start.")
+        if stagger_idle:
+            self._start_next_pending_instance()
+            self._start_timer.start(stagger_delay_ms)
 
         self.status_update.emit(f"Scheduled start for {len(instances_to_start)} instance(s)...", 3000)
         # Update buttons immediately AFTER scheduling all starts
@@ -600,11 +656,31 @@ class MultiModeWidget(QWidget):
         self._update_action_button_states()
 
 
+    @pyqtSlot()
+    def _start_next_pending_instance(self):
+        """
+        Starts the next queued instance. The stagger timer stops on the first tick
+        that finds the queue empty, so it stays active for one interval after the
+        last start and a new Start All can't begin inside that gap.
+        """
+        if self._pending_starts:
+            self._safely_start_instance_weak(self._pending_starts.popleft())
+        else:
+            self._start_timer.stop()
+
+    def _safely_start_instance_weak(self, widget_ref: "weakref.ref[InstanceWidget]"):
+        """Starts the referenced instance unless it was removed (and collected) while queued."""
+        instance_widget = widget_ref()
+        if instance_widget is None:
+            log_debug("Queued start skipped: instance was removed before its turn.")
+            return
+        self._safely_start_instance(instance_widget)
+
     def _safely_start_instance(self, instance_widget: InstanceWidget):
         """Helper method called by QTimer to start a single instance, checking its state first."""
         instance_id = instance_widget.get_instance_id()
         # Double-check if the instance is still idle before starting
-        if instance_widget and not instance_widget.is_running() and not instance_widget.is_looping():
+        if instance_widget and not instance_widget.is_active():
             log_info(f"Timer fired: Starting Instance {instance_id}")
             try:
                 # Ensure UI reflects 'generating' state briefly before worker starts
@@ -632,13 +708,7 @@ class MultiModeWidget(QWidget):
         """Stops generation and/or cancels loops on all applicable instances."""
         log_info("Attempting to stop all active (running or looping) instances...")
         stopped_count = 0
-        instances_to_stop = []
-
-        for instance_widget in self._instance_widgets.values():
-             # Check if running OR looping
-             # Use the public methods which now handle the logic correctly
-             if instance_widget.is_running() or instance_widget.is_looping():
-                  instances_to_stop.append(instance_widget)
+        instances_to_stop = [self._instance_widgets[i] for i in sorted(self._active_instance_ids())]
 
         if not instances_to_stop:
              self.status_update.emit("No instances were running or looping to stop.", 3000)
@@ -648,16 +718,18 @@ class MultiModeWidget(QWidget):
         log_info(f"Requesting stop for {len(instances_to_stop)} active instance(s)...")
         for instance_widget in instances_to_stop:
             instance_id = instance_widget.get_instance_id()
-            was_looping = instance_widget.is_looping()
+            was_looping = instance_id in self._looping_ids
             log_debug(f"Requesting stop for instance {instance_id} (Looping: {was_looping})")
             # Call the instance's stop_generation method.
             # This method now handles both cancelling the worker AND
             # ensuring the loop flag is cleared if it was active.
             instance_widget.stop_generation()
             stopped_count += 1
-            if force: # Process events more aggressively if forcing (e.g., on close)
-                 QApplication.processEvents()
-                 time.sleep(0.02)
+
+        if force: # e.g. on close: one bounded event pass after all stops are issued.
+            # The cancel calls run on each worker's own thread; this only lets results
+            # already posted back to the GUI thread be handled.
+            QCoreApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 50)
 
         self.status_update.emit(f"Requested stop for {stopped_count} instance(s).", 3000)
         # Buttons will update as instances emit generation_finished signals.
@@ -671,35 +743,52 @@ class MultiModeWidget(QWidget):
         log_info("Attempting to clear results for all truly idle instances.")
         if not self._instance_widgets: return
 
-        instances_to_clear = []
-        for instance_widget in self._instance_widgets.values():
-             if not instance_widget.is_running() and not instance_widget.is_looping():
-                  instances_to_clear.append(instance_widget)
+        active_ids = self._active_instance_ids()
+        instances_to_clear = [w for i, w in self._instance_widgets.items() if i not in active_ids]
 
         if not instances_to_clear:
              show_info_message(self, "Clear Results", "No instances are currently idle (not running and not looping) to clear.")
              return
 
-        reply = QMessageBox.question(self, "Confirm Clear",
-                                     f"Are you sure you want to clear the results from {len(instances_to_clear)} idle instance(s)?",
-                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                                     QMessageBox.StandardButton.No)
+        if self._confirm_clear_box is None:
+            self._confirm_clear_box = QMessageBox(QMessageBox.Icon.Question, "Confirm Clear", "",
+                                                  QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                                  self)
+        self._confirm_clear_box.setDefaultButton(QMessageBox.StandardButton.No)
+        self._confirm_clear_box.setText(f"Are you sure you want to clear the results from {len(instances_to_clear)} idle instance(s)?")
+        reply = QMessageBox.StandardButton(self._confirm_clear_box.exec()) # exec() returns a plain int in PyQt6
 
         if reply == QMessageBox.StandardButton.Yes:
             cleared_count = 0
             for instance_widget in instances_to_clear:
                  # Double check state again just before clearing
-                 if not instance_widget.is_running() and not instance_widget.is_looping():
+                 if not instance_widget.is_active():
                       log_debug(f"Clearing results for instance {instance_widget.get_instance_id()}")
                       instance_widget.result_text_edit.clear()
                       instance_widget.clear_thumbnail() # Use method to clear thumb/set placeholder
                       instance_widget._full_result_pixmap = None # Clear full pixmap too
                       instance_widget._update_status_label("Results cleared.") # Update instance status
-                      QTimer.singleShot(2000, lambda w=instance_widget: w._update_status_label("Ready.") if not w.is_running() else None) # Reset status later
+                      self._status_reset_queue.append(weakref.ref(instance_widget)) # Reset status later
                       cleared_count += 1
                  else:
                       log_warning(f"Skipping clear for instance #{instance_widget.get_instance_id()} as its state changed.")
 
+            if self._status_reset_queue:
+                self._status_reset_timer.start()
             self.status_update.emit(f"Results cleared for {cleared_count} idle instance(s).", 3000)
         else:
-            self.status_update.emit("Clear results cancelled.", 2000)
\ No newline at end of file
+            self.status_update.emit("Clear results cancelled.", 2000)
+
+    @pyqtSlot()
+    def _drain_status_reset_queue(self):
+        """Resets the status of every instance queued by _clear_all_results."""
+        queued, self._status_reset_queue = self._status_reset_queue, []
+        for widget_ref in queued:
+            instance_widget = widget_ref()
+            if instance_widget is not None:
+                self._reset_status_if_idle(instance_widget)
+
+    def _reset_status_if_idle(self, instance_widget: InstanceWidget):
+        """Sets an instance's status back to 'Ready.' unless it has started generating again."""
+        if not instance_widget.is_running():
+            instance_widget._update_status_label("Ready.")
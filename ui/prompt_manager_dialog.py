@@ -1,32 +1,142 @@
 import os
+import shutil
+import stat
 import traceback
 from pathlib import Path
-from typing import Dict, Optional, List, Tuple
+from typing import Dict, Optional, List, Set, Tuple
 
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, QTextEdit,
     QPushButton, QLineEdit, QLabel, QDialogButtonBox, QMessageBox, QScrollArea, QWidget,
-    QFileDialog, QGroupBox, QApplication, QSizePolicy, QFrame, QSplitter
+    QFileDialog, QGroupBox, QApplication, QSizePolicy, QFrame, QSplitter, QLayout
 )
-from PyQt6.QtGui import QPixmap, QMouseEvent, QPainter, QColor, QPen, QImage, QFontMetrics  # Added QImage
-from PyQt6.QtCore import Qt, pyqtSignal, QSize, QTimer, pyqtSlot, QObject, QEvent
+from PyQt6.QtGui import QPixmap, QPixmapCache, QImageReader, QMouseEvent, QPainter, QColor, QPen, QImage, QFontMetrics  # Added QImage
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QTimer, pyqtSlot, QObject, QEvent, QRunnable, QThreadPool
 
 # --- Project Imports ---
 from core.prompt_service import PromptService
 from core.wildcard_resolver import WildcardResolver # For wildcard names
 from core.settings_service import SettingsService # <<< --- ADD THIS LINE --- <<<
-from utils.logger import log_debug, log_error, log_warning, log_info
+from utils.logger import log_debug, log_error, log_warning, log_info, log_critical
 from utils.helpers import show_error_message, show_info_message, get_themed_icon
 from utils import constants
 from core.image_processor import ImageProcessor # For thumbnail loading
 
+# =============================================================================
+# Wildcard Listing
+# =============================================================================
+# Sorted wildcard names, reused across dialog opens until the directory's
+# mtime changes (adding, removing or renaming a file bumps it).
+_wildcard_names_cache: Optional[Tuple[int, List[str]]] = None
+
+
+def _list_wildcard_names() -> Optional[List[str]]:
+    """Returns the sorted wildcard names, or None if the wildcards directory is missing."""
+    global _wildcard_names_cache
+    try:
+        dir_stat = constants.WILDCARDS_DIR.stat()
+    except OSError:
+        return None
+    if not stat.S_ISDIR(dir_stat.st_mode):
+        return None
+    if _wildcard_names_cache is None or _wildcard_names_cache[0] != dir_stat.st_mtime_ns:
+        names = sorted(p.stem for p in constants.WILDCARDS_DIR.glob("*.json"))
+        _wildcard_names_cache = (dir_stat.st_mtime_ns, names)
+    return _wildcard_names_cache[1]
+
+
+# =============================================================================
+# Background Thumbnail Loading
+# =============================================================================
+# Scaled thumbnails live in Qt's process-wide QPixmapCache (size-bounded LRU,
+# limit set in main_app). Keys encode path, mtime and target size so edits invalidate.
+def _thumbnail_cache_key(thumb_file: Path, mtime_ns: int, target_size: QSize) -> str:
+    """Builds the QPixmapCache key for a scaled prompt thumbnail."""
+    return f"promptThumb:{thumb_file}:{mtime_ns}:{target_size.width()}x{target_size.height()}"
+
+
+class _ThumbnailLoadSignals(QObject):
+    """Signal carrier for _ThumbnailLoadTask (QRunnable cannot declare signals)."""
+    loaded = pyqtSignal(int, QImage) # request token, decoded+scaled image (null on failure)
+
+
+class _ThumbnailLoadTask(QRunnable):
+    """
+    Decodes a thumbnail file at its display size on a QThreadPool thread.
+    QImageReader streams the file itself (no Python-side bytes copy) and,
+    via setScaledSize, lets decoders that support it (e.g. JPEG) decode
+    straight to the reduced size instead of full resolution.
+    """
+
+    def __init__(self, token: int, thumb_file: Path, target_size: QSize):
+        super().__init__()
+        self.token = token
+        self.thumb_file = thumb_file
+        self.target_size = target_size
+        self.signals = _ThumbnailLoadSignals()
+
+    def run(self):
+        image = QImage()
+        try:
+            reader = QImageReader(str(self.thumb_file))
+            source_size = reader.size() # Header only; invalid if the format can't report it
+            if source_size.isValid():
+                fitted_size = source_size.scaled(self.target_size, Qt.AspectRatioMode.KeepAspectRatio)
+                if fitted_size != source_size: # Stored thumbnails are usually display-sized already
+                    reader.setScaledSize(fitted_size)
+            decoded = reader.read()
+            if decoded.isNull():
+                log_warning(f"Could not decode thumbnail {self.thumb_file}: {reader.errorString()}")
+            else:
+                if not source_size.isValid():
+                    decoded = decoded.scaled(
+                        self.target_size,
+                        Qt.AspectRatioMode.KeepAspectRatio,
+                        Qt.TransformationMode.SmoothTransformation
+                    )
+                image = self._to_pixmap_format(decoded)
+        except Exception as e:
+            log_error(f"Error loading thumbnail from {self.thumb_file}: {e}", exc_info=True)
+        # QImage (unlike QPixmap) is safe to hand across threads; QPixmap is built on the GUI thread
+        self.signals.loaded.emit(self.token, image)
+
+    @staticmethod
+    def _to_pixmap_format(image: QImage) -> QImage:
+        """
+        Converts to the raster pixmap's native format here on the worker thread,
+        so QPixmap.fromImage on the GUI thread needs no per-pixel conversion.
+        """
+        if image.hasAlphaChannel():
+            return image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+        return image.convertToFormat(QImage.Format.Format_RGB32)
+
+
+class _ThumbnailCreateSignals(QObject):
+    """Signal carrier for _ThumbnailCreateTask."""
+    created = pyqtSignal(int, str, object) # job token, slot key, PNG bytes (None on failure)
+
+
+class _ThumbnailCreateTask(QRunnable):
+    """Builds a prompt thumbnail (decode, resample, PNG encode) from a picked image on a QThreadPool thread."""
+
+    def __init__(self, token: int, slot_key: str, source_path: Path):
+        super().__init__()
+        self.token = token
+        self.slot_key = slot_key
+        self.source_path = source_path
+        self.signals = _ThumbnailCreateSignals()
+
+    def run(self):
+        thumb_bytes = ImageProcessor.create_thumbnail_bytes(self.source_path, size=constants.PROMPT_THUMBNAIL_SIZE)
+        self.signals.created.emit(self.token, self.slot_key, thumb_bytes)
+
+
 # =============================================================================
 # Custom Widget for a Single Prompt Entry
 # =============================================================================
 class PromptEntryWidget(QFrame):
     """Widget representing a single prompt entry with thumbnail, name, and text."""
     # Signals
-    change_occurred = pyqtSignal(str) # slot_key - when name/text/thumb changes
     clicked = pyqtSignal(str)         # slot_key - when the widget is clicked for selection
     request_thumbnail = pyqtSignal(str) # slot_key - when thumbnail is clicked
 
@@ -39,13 +149,18 @@ class PromptEntryWidget(QFrame):
 
 
 
-    def __init__(self, slot_key: str, name: str, text: str, relative_thumb_filename: Optional[str], assets_dir: Path, parent=None):
+    def __init__(self, slot_key: str, name: str, text: str, relative_thumb_filename: Optional[str], assets_dir: Path, parent=None,
+                 defer_thumbnail: bool = False):
             super().__init__(parent)
             self.slot_key = slot_key
             self._relative_thumb_filename = relative_thumb_filename
             self._assets_dir = assets_dir
             self._selected = False
             self._pixmap: Optional[QPixmap] = None
+            self._thumb_load_token = 0 # Incremented per load so stale async results are dropped
+            self._pending_thumb_cache_key: Optional[str] = None
+            self._pending_text: Optional[str] = text # Applied after construction, see _apply_pending_text
+            self._thumbnail_pending = defer_thumbnail # True until the first load_thumbnail() call
 
             # --- Style & Sizing ---
             self.setObjectName(f"promptEntry_{slot_key}")
@@ -66,7 +181,7 @@ class PromptEntryWidget(QFrame):
             self.thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.thumbnail_label.setStyleSheet("QLabel { border: 1px solid grey; background-color: #e0e0e0; color: grey; }")
             self.thumbnail_label.setToolTip("Click to select a thumbnail image")
-            self.thumbnail_label.mousePressEvent = self._on_thumbnail_click
+            self.thumbnail_label.installEventFilter(self) # Clicks handled in eventFilter
             layout.addWidget(self.thumbnail_label)
 
             # Right Panel (Name + Text)
@@ -91,111 +206,184 @@ class PromptEntryWidget(QFrame):
             self.name_edit = QLineEdit(name)
             self.name_edit.setObjectName(f"promptName_{slot_key}")
             self.name_edit.setPlaceholderText("Prompt Name")
-            self.name_edit.textChanged.connect(self._on_change)
             name_layout.addWidget(self.name_edit, 1) # Name edit takes remaining space
 
             right_panel_layout.addLayout(name_layout) # Add the new HBox here
             # --- END ADD BLOCK ---
 
 
-            # Text Editor
-            self.text_edit = QTextEdit(text)
+            # Text Editor (created empty; text layout is deferred off the construction path)
+            self.text_edit = QTextEdit()
             self.text_edit.setObjectName(f"promptText_{slot_key}")
             self.text_edit.setPlaceholderText("Prompt Text...")
             self.text_edit.setAcceptRichText(False)
             self.text_edit.installEventFilter(self)
             self.text_edit.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-            self.text_edit.textChanged.connect(self._on_change)
             right_panel_layout.addWidget(self.text_edit, 1) # Add stretch
 
             layout.addLayout(right_panel_layout, 1)
+            QTimer.singleShot(0, Qt.TimerType.CoarseTimer, self._apply_pending_text)
 
-            self.load_thumbnail() # This will now scale to the larger label size
+            if defer_thumbnail:
+                self._show_thumbnail_placeholder() # Caller starts the load via load_thumbnail()
+            else:
+                self.load_thumbnail() # This will now scale to the larger label size
 
 
 
 
    
+    def _apply_pending_text(self):
+        """Fills the text editor with the initial prompt text, once, without reporting an edit."""
+        if self._pending_text is None:
+            return
+        text, self._pending_text = self._pending_text, None
+        self.text_edit.blockSignals(True) # Initial content is not a user change
+        try:
+            self.text_edit.setPlainText(text)
+        finally:
+            self.text_edit.blockSignals(False)
+
     def get_data(self) -> Tuple[str, str, Optional[str]]:
         """Returns the current name, text, and relative thumbnail filename."""
+        self._apply_pending_text() # Never report an empty text for a not-yet-filled editor
         return (
             self.name_edit.text().strip(),
             self.text_edit.toPlainText().strip(),
             self._relative_thumb_filename # Return the relative name
         )
 
+    def set_data(self, name: str, text: str, relative_thumb_filename: Optional[str]):
+        """Shows externally saved data without reporting an edit; unchanged fields are left untouched."""
+        if self.name_edit.text() != name:
+            self.name_edit.blockSignals(True)
+            self.name_edit.setText(name)
+            self.name_edit.blockSignals(False)
+        if self._pending_text is not None:
+            self._pending_text = text # Not laid out yet; just swap what will be applied
+        elif self.text_edit.toPlainText() != text:
+            self.text_edit.blockSignals(True)
+            self.text_edit.setPlainText(text)
+            self.text_edit.blockSignals(False)
+        self._relative_thumb_filename = relative_thumb_filename
+        if not self._thumbnail_pending:
+            # The same filename may now hold a new image; QPixmapCache keeps unchanged ones cheap
+            self.load_thumbnail()
+
+    def get_name_and_thumbnail(self) -> Tuple[str, Optional[str]]:
+        """Like get_data() without copying the (possibly large) prompt text."""
+        return self.name_edit.text().strip(), self._relative_thumb_filename
+
     def get_text_editor(self) -> QTextEdit:
         """Returns the QTextEdit widget for external manipulation (like wildcard insertion)."""
+        self._apply_pending_text()
         return self.text_edit
 
+    def is_thumbnail_pending(self) -> bool:
+        """True while a deferred thumbnail has not been requested yet."""
+        return self._thumbnail_pending
+
     def set_relative_thumbnail_filename(self, filename: Optional[str]):
         """Sets the relative thumbnail filename and reloads the thumbnail."""
-        if self._relative_thumb_filename != filename:
-            self._relative_thumb_filename = filename
-            self.load_thumbnail() # Reload based on the new filename
-            self.change_occurred.emit(self.slot_key) # Signal change
+        self._relative_thumb_filename = filename
+        # Always reload: thumbnails keep the standard "<slot>.png" name, so a
+        # replaced image usually arrives under the same filename
+        self.load_thumbnail()
 
 
     def load_thumbnail(self):
-        """Loads and displays the thumbnail using the relative filename and assets_dir."""
+        """
+        Starts loading the thumbnail using the relative filename and assets_dir.
+        Decoding and scaling run on the global QThreadPool; a placeholder is shown
+        until _on_thumbnail_loaded receives the result.
+        """
         self._pixmap = None # Clear previous pixmap
+        self._thumbnail_pending = False
+        self._thumb_load_token += 1 # Invalidate any load still in flight
+        self._pending_thumb_cache_key = None
         if self._relative_thumb_filename and self._assets_dir:
             thumb_file = self._assets_dir / self._relative_thumb_filename
-            if thumb_file.is_file():
-                try:
-                    # Use processor to handle loading/resizing safely
-                    # Load directly from the saved thumbnail file
-                    img_bytes = thumb_file.read_bytes()
-                    if img_bytes:
-                         qimage = QImage.fromData(img_bytes)
-                         if not qimage.isNull():
-                              self._pixmap = QPixmap.fromImage(qimage)
-                    if self._pixmap:
-                        # Scale to fit the label
-                        target_size = self.thumbnail_label.size()
-                        if target_size.width() <= 1 or target_size.height() <= 1:
-                            target_size = self.THUMBNAIL_SIZE # Fallback size
-                        self.thumbnail_label.setPixmap(self._pixmap.scaled(
-                            target_size, # Scale to label size
-                            Qt.AspectRatioMode.KeepAspectRatio,
-                            Qt.TransformationMode.SmoothTransformation
-                        ))
-                        self.thumbnail_label.setToolTip(f"Thumbnail: {self._relative_thumb_filename}\nClick to change.")
-                        return # Success
-                    else:
-                         log_warning(f"Failed to load QPixmap for {self.slot_key} from {thumb_file}")
-
-                except Exception as e:
-                    log_error(f"Error loading thumbnail for {self.slot_key} from {thumb_file}: {e}", exc_info=True)
+            try:
+                thumb_stat = thumb_file.stat() # Single stat serves both the existence check and the cache key
+            except OSError:
+                thumb_stat = None
+            if thumb_stat is not None and stat.S_ISREG(thumb_stat.st_mode):
+                target_size = self.thumbnail_label.size()
+                if target_size.width() <= 1 or target_size.height() <= 1:
+                    target_size = self.THUMBNAIL_SIZE # Fallback size
+                cache_key = _thumbnail_cache_key(thumb_file, thumb_stat.st_mtime_ns, target_size)
+                cached_pixmap = QPixmapCache.find(cache_key)
+                if cached_pixmap is not None and not cached_pixmap.isNull():
+                    self._show_thumbnail_pixmap(cached_pixmap)
+                    return
+                self._pending_thumb_cache_key = cache_key
+                task = _ThumbnailLoadTask(self._thumb_load_token, thumb_file, target_size)
+                task.signals.loaded.connect(self._on_thumbnail_loaded, Qt.ConnectionType.QueuedConnection)
+                self.thumbnail_label.clear()
+                self.thumbnail_label.setText("Loading...")
+                QThreadPool.globalInstance().start(task)
+                return
             else:
                  log_warning(f"Thumbnail file for {self.slot_key} not found: {thumb_file}")
                  # Optionally reset the path if invalid?
                  # self._relative_thumb_filename = None
-                 # self.change_occurred.emit(self.slot_key)
+                 # (the dialog would then need to mark the slot as changed)
 
         # Fallback / No thumbnail
+        self._show_thumbnail_placeholder()
+
+
+
+    @pyqtSlot(int, QImage)
+    def _on_thumbnail_loaded(self, token: int, image: QImage):
+        """Receives a decoded thumbnail from the thread pool and displays it."""
+        if token != self._thumb_load_token:
+            return # A newer load superseded this one
+        if image.isNull():
+            log_warning(f"Failed to load thumbnail for {self.slot_key} from {self._relative_thumb_filename}")
+            self._show_thumbnail_placeholder()
+            return
+        pixmap = QPixmap.fromImage(image, Qt.ImageConversionFlag.NoFormatConversion)
+        if self._pending_thumb_cache_key is not None:
+            QPixmapCache.insert(self._pending_thumb_cache_key, pixmap)
+            self._pending_thumb_cache_key = None
+        self._show_thumbnail_pixmap(pixmap)
+
+    def _show_thumbnail_pixmap(self, pixmap: QPixmap):
+        """Displays an already scaled thumbnail pixmap."""
+        self._pixmap = pixmap
+        self.thumbnail_label.setPixmap(pixmap)
+        self.thumbnail_label.setToolTip(f"Thumbnail: {self._relative_thumb_filename}\nClick to change.")
+
+    def _show_thumbnail_placeholder(self):
+        """Shows the 'No Thumb' placeholder in the thumbnail label."""
         self.thumbnail_label.clear()
         self.thumbnail_label.setText("No\nThumb")
         self.thumbnail_label.setToolTip("Click to select a thumbnail image")
 
-
-
     def set_selected(self, selected: bool):
         """Sets the visual selection state using a QSS property."""
-        if self._selected != selected:
-            self._selected = selected
-            self.setProperty("selected", selected) # Set the custom property
-            # Force a style re-computation
-            self.style().polish(self)
-            self.update() # Request redraw if needed after style change
+        if self._selected == selected:
+            return # Property unchanged; skip the stylesheet re-evaluation entirely
+        self._selected = selected
+        self.setProperty("selected", selected) # Set the custom property
+        # Re-evaluate the [selected="..."] rules for this widget only (not its
+        # siblings); unpolish first so Qt drops the cached rule match
+        style = self.style()
+        style.unpolish(self)
+        style.polish(self)
+        self.update() # Request redraw if needed after style change
 
     def eventFilter(self, source: QObject, event: QEvent) -> bool:
-        """Filters wheel events on the text edit to prevent content scrolling."""
+        """Filters wheel events on the text edit and mouse presses on the thumbnail label."""
         # Check if the event source is the text_edit within this widget
         if source == self.text_edit and event.type() == QEvent.Type.Wheel:
             # Ignore the wheel event on the text edit
             event.ignore() # Mark as ignored so it might propagate
             return True # Indicate we've handled (ignored) it here
+        if source == self.thumbnail_label and event.type() == QEvent.Type.MouseButtonPress:
+            self._on_thumbnail_click(event)
+            return event.button() == Qt.MouseButton.LeftButton # Only left clicks are consumed
         # For all other events or sources, use default processing
         return super().eventFilter(source, event)
 
@@ -215,17 +403,28 @@ class PromptEntryWidget(QFrame):
             self.request_thumbnail.emit(self.slot_key)
             event.accept()
 
-    def _on_change(self):
-        """Emit signal when name or text changes."""
-        self.change_occurred.emit(self.slot_key)
 
 # =============================================================================
 # Redesigned Prompt Manager Dialog
 # =============================================================================
 class PromptManagerDialog(QDialog):
-    """Dialog for managing saved prompts with improved UI and delayed saving."""
+    """
+    Dialog for managing saved prompts with improved UI and delayed saving.
+
+    Performance notes (the costs here are Qt widget/I-O work, not numeric loops,
+    so JIT tooling such as Numba/PyPy has nothing to speed up in this module):
+      - Prompt data: served from PromptService memory with a cached slot order
+        (get_sorted_slot_keys); nothing is re-read from disk on open.
+      - Entry construction: _load_prompts builds a detached container and swaps
+        it in; entry text is applied after construction and thumbnails load only
+        near the viewport (_load_visible_thumbnails).
+      - Image work: thumbnail decode (_ThumbnailLoadTask) and creation
+        (_ThumbnailCreateTask) run on QThreadPool, results cached in QPixmapCache.
+    """
 
     Accepted = QDialog.DialogCode.Accepted # Re-use standard code
+    CHANGE_DEBOUNCE_MS = 200 # Collapse bursts of keystrokes into one change notification
+    VISIBLE_THUMB_DEBOUNCE_MS = 50 # Coalesce scroll/resize bursts before realizing thumbnails
 
     def __init__(self,
                  prompt_service: PromptService,
@@ -244,8 +443,42 @@ class PromptManagerDialog(QDialog):
         self._prompt_widgets: Dict[str, PromptEntryWidget] = {} # slot_key -> widget
         self._selected_slot_key: Optional[str] = None
         self._is_dirty = False # Track unsaved changes
+        # Edits from every entry funnel into one debounced hub (see _on_entry_edited)
+        self._pending_change_slots: Set[str] = set()
+        self._dirty_slots: Set[str] = set() # Entries whose name/text/thumbnail changed since load
+        self._change_timer = QTimer(self)
+        self._change_timer.setSingleShot(True)
+        self._change_timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self._change_timer.setInterval(self.CHANGE_DEBOUNCE_MS)
+        self._change_timer.timeout.connect(self._flush_pending_changes)
+        # Thumbnails are realized only for entries in (or near) the viewport
+        self._visible_thumbs_timer = QTimer(self)
+        self._visible_thumbs_timer.setSingleShot(True)
+        self._visible_thumbs_timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self._visible_thumbs_timer.setInterval(self.VISIBLE_THUMB_DEBOUNCE_MS)
+        self._visible_thumbs_timer.timeout.connect(self._load_visible_thumbnails)
+        # Scroll-into-view after a selection runs once per event-loop pass, for the latest selection
+        self._pending_scroll_timer = QTimer(self)
+        self._pending_scroll_timer.setSingleShot(True)
+        self._pending_scroll_timer.setInterval(0)
+        self._pending_scroll_timer.timeout.connect(self._scroll_to_selected)
+        # Selection after external updates: bursts of prompts_updated collapse into one click
+        self._pending_select_key: Optional[str] = None
+        self._pending_select_timer = QTimer(self)
+        self._pending_select_timer.setSingleShot(True)
+        self._pending_select_timer.setInterval(0)
+        self._pending_select_timer.timeout.connect(self._apply_pending_selection)
+        # (signal, slot, connection) for service signals; see _connect_service_signal
+        self._service_connections: List[Tuple[object, object, object]] = []
         self._selected_prompt_to_load: Optional[str] = None
         self._selected_target: Optional[str] = None # Stores "single" or "multi_{id}"
+        self._has_loadable_target = False # Set when the Multi-mode target list is built
+        # In-flight thumbnail builds: slot_key -> (job token, old thumbnail filename, source file name)
+        self._thumbnail_jobs: Dict[str, Tuple[int, Optional[str], str]] = {}
+        self._thumbnail_job_token = 0
+        self._wildcard_buttons: List[QPushButton] = [] # Filled by _setup_wildcard_buttons
+        self._shown_wildcard_names: Optional[List[str]] = None # Names the current button row was built from
+        self._wildcards_enabled = True # Enabled state last applied to _wildcard_buttons
         # +++ START ADD +++
         # Define the assets directory for this dialog instance
         self._assets_dir = constants.PROMPTS_ASSETS_DIR
@@ -257,8 +490,20 @@ class PromptManagerDialog(QDialog):
         self._setup_ui()
         self._connect_signals()
         self._load_prompts()
+        self._configure_for_mode()
+
+    def prepare_for_open(self, current_mode: str, multi_mode_instance_data: Optional[List[Tuple[int, str, str, str]]]):
+        """Readies a retained dialog for another exec(): reloads prompts and the load target for the new context."""
+        self.current_mode = current_mode
+        self.multi_mode_instance_data = multi_mode_instance_data or []
+        self._selected_prompt_to_load = None
+        self._selected_target = None
+        self._setup_wildcard_buttons() # No-op unless the wildcard files changed
+        self._load_prompts()
+        self._configure_for_mode()
 
-        # Configure UI based on mode
+    def _configure_for_mode(self):
+        """Shows the Multi-mode target selector or hides it, then refreshes button states."""
         if self.current_mode == "Multi":
             self._setup_multi_mode_target_selector()
         else:
@@ -285,13 +530,7 @@ class PromptManagerDialog(QDialog):
         self.wildcard_scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self.wildcard_scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
 
-        wildcard_widget = QWidget()
-        wildcard_widget.setObjectName("wildcardContainer")
-        self.wildcard_button_layout = QHBoxLayout(wildcard_widget)
-        self.wildcard_button_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
         self._setup_wildcard_buttons() # Populate the wildcard buttons
-
-        self.wildcard_scroll_area.setWidget(wildcard_widget)
         wildcard_group_layout.addWidget(self.wildcard_scroll_area)
         # Add wildcard group first to the main vertical layout
         main_layout.addWidget(wildcard_group) # Give it minimal vertical stretch
@@ -315,21 +554,7 @@ class PromptManagerDialog(QDialog):
         # Set a minimum width for usability
         # self.scroll_area.setMinimumWidth(450) # Minimum width is now controlled by splitter
 
-        self.scroll_widget = QWidget() # Container widget inside scroll area
-        self.scroll_widget.setObjectName("promptScrollContainer")
-        self.prompts_layout = QVBoxLayout(self.scroll_widget) # Layout for PromptEntryWidgets
-        self.prompts_layout.setObjectName("promptsEntryLayout")
-        self.prompts_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.prompts_layout.setSpacing(10) # Spacing between entries
-
-        # Placeholder when empty
-        self.placeholder_label = QLabel("Click 'Add New Prompt' to begin.")
-        self.placeholder_label.setObjectName("promptPlaceholderLabel")
-        self.placeholder_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.placeholder_label.setMinimumHeight(100)
-        self.prompts_layout.addWidget(self.placeholder_label)
-        self.prompts_layout.addStretch(1) # Push entries up
-
+        self._build_prompt_container()
         self.scroll_area.setWidget(self.scroll_widget)
         left_pane_layout.addWidget(self.scroll_area) # Add scroll area to the left pane layout
         content_splitter.addWidget(left_pane_widget) # Add left pane to splitter
@@ -403,34 +628,63 @@ class PromptManagerDialog(QDialog):
 
     def _setup_wildcard_buttons(self):
         """Populates the horizontal scroll area with wildcard buttons."""
-        # Clear existing buttons if any
-        while self.wildcard_button_layout.count():
-            item = self.wildcard_button_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
+        listing_error = None
+        try:
+            wildcard_names = _list_wildcard_names()
+        except Exception as e:
+            listing_error = e
+            wildcard_names = None
+        if wildcard_names is not None and wildcard_names == self._shown_wildcard_names:
+            return # Row already shows exactly these wildcards
+        self._shown_wildcard_names = wildcard_names
+        # Build the row in a new, detached container and swap it in (replacing any
+        # previous row in one go rather than removing its buttons one by one)
+        wildcard_widget = QWidget()
+        wildcard_widget.setObjectName("wildcardContainer")
+        self.wildcard_button_layout = QHBoxLayout(wildcard_widget)
+        self.wildcard_button_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        # The button row is sized from its contents only; the fixed-height area scrolls it
+        self.wildcard_button_layout.setSizeConstraint(QLayout.SizeConstraint.SetMinAndMaxSize)
+        self._wildcard_buttons = []
+        self._wildcards_enabled = True # New buttons start enabled
 
         try:
-            if constants.WILDCARDS_DIR.is_dir():
-                wildcard_files = sorted(constants.WILDCARDS_DIR.glob("*.json"))
-                if not wildcard_files:
+            if listing_error is not None:
+                raise listing_error
+            if wildcard_names is not None:
+                if not wildcard_names:
                      self.wildcard_button_layout.addWidget(QLabel("No wildcards found."))
                 else:
-                    for w_file in wildcard_files:
-                        wc_name = w_file.stem # Get name without extension
+                    for wc_name in wildcard_names:
                         button = QPushButton(wc_name)
                         button.setObjectName(f"wildcardBtn_{wc_name}")
                         button.setToolTip(f"Insert [{wc_name}]")
                         button.setFlat(True) # Make them look less bulky
-                        # Use lambda to capture the correct name for the slot
-                        button.clicked.connect(lambda checked=False, name=wc_name: self._insert_wildcard(name))
+                        # One shared slot for all buttons; the name rides along as a property
+                        button.setProperty("wc_name", wc_name)
+                        button.clicked.connect(self._on_wildcard_clicked)
                         self.wildcard_button_layout.addWidget(button)
+                        self._wildcard_buttons.append(button)
             else:
                  self.wildcard_button_layout.addWidget(QLabel("Wildcards dir not found."))
         except Exception as e:
             log_error(f"Error loading wildcards for helper: {e}", exc_info=True)
             self.wildcard_button_layout.addWidget(QLabel("Error loading wildcards."))
         self.wildcard_button_layout.addStretch(1)
+        self.wildcard_button_layout.activate() # Single layout pass for the whole row
+
+        old_container = self.wildcard_scroll_area.takeWidget()
+        if old_container is not None:
+            old_container.deleteLater()
+        self.wildcard_scroll_area.setWidget(wildcard_widget)
+
+    @pyqtSlot()
+    def _on_wildcard_clicked(self):
+        """Shared clicked slot for the wildcard buttons."""
+        sender = self.sender()
+        wildcard_name = sender.property("wc_name") if sender is not None else None
+        if wildcard_name:
+            self._insert_wildcard(wildcard_name)
 
     def _insert_wildcard(self, wildcard_name: str):
         """Inserts the selected wildcard into the currently selected prompt's text edit."""
@@ -468,6 +722,7 @@ class PromptManagerDialog(QDialog):
 
                 self.target_list_widget.addItem(item)
 
+        self._has_loadable_target = has_loadable_target
         self.target_group.setVisible(True)
         self._update_action_buttons() # Update load button state
 
@@ -477,29 +732,54 @@ class PromptManagerDialog(QDialog):
         self.load_button.clicked.connect(self._initiate_load_prompt)
         self.button_box.rejected.connect(self.reject) # Close button
 
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self._schedule_visible_thumbnails)
+        scroll_bar.rangeChanged.connect(self._schedule_visible_thumbnails)
+
         # Connect double-click on target list (optional convenience)
         if hasattr(self, 'target_list_widget'):
             self.target_list_widget.itemDoubleClicked.connect(self._handle_target_double_click)
 
+    def _build_prompt_container(self):
+        """Creates a fresh (detached) container holding the placeholder and the trailing stretch."""
+        self.scroll_widget = QWidget() # Container widget inside scroll area
+        self.scroll_widget.setObjectName("promptScrollContainer")
+        self.prompts_layout = QVBoxLayout(self.scroll_widget) # Layout for PromptEntryWidgets
+        self.prompts_layout.setObjectName("promptsEntryLayout")
+        self.prompts_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        self.prompts_layout.setSpacing(10) # Spacing between entries
+
+        # Placeholder when empty
+        self.placeholder_label = QLabel("Click 'Add New Prompt' to begin.")
+        self.placeholder_label.setObjectName("promptPlaceholderLabel")
+        self.placeholder_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.placeholder_label.setMinimumHeight(100)
+        self.prompts_layout.addWidget(self.placeholder_label)
+        self.prompts_layout.addStretch(1) # Push entries up
+
     def _load_prompts(self):
         """Loads prompts from service and creates/updates widgets."""
         log_debug("Loading prompts into manager dialog.")
-        # Clear existing widgets
-        while self.prompts_layout.count() > 1: # Keep placeholder + stretch
-            item = self.prompts_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
+        # Rebuild into a new, not-yet-shown container and swap it in: no per-item
+        # removal churn, and the new column is laid out once when it is shown
+        old_container = self.scroll_area.takeWidget()
+        if old_container is not None:
+            old_container.deleteLater()
         self._prompt_widgets.clear()
+        self._pending_change_slots.clear()
+        self._dirty_slots.clear()
         self._selected_slot_key = None
         self._is_dirty = False # Reset dirty flag on full reload
+        self._build_prompt_container()
 
         prompts_data = self.prompt_service.get_all_prompts_full()
-        sorted_slots = sorted(prompts_data.keys(), key=lambda k: int(k.split('_')[-1]) if k.startswith("slot_") else float('inf'))
+        # Thumbnail builds still running keep their job if the slot survived the reload;
+        # on completion they mark the rebuilt entry dirty (or save directly if hidden)
+        self._thumbnail_jobs = {slot_key: job for slot_key, job in self._thumbnail_jobs.items()
+                                if slot_key in prompts_data}
+        sorted_slots = self.prompt_service.get_sorted_slot_keys()
 
-        if not sorted_slots:
-            self.placeholder_label.show()
-        else:
+        if sorted_slots:
             self.placeholder_label.hide()
             for slot_key in sorted_slots:
                 data = prompts_data[slot_key]
@@ -507,13 +787,20 @@ class PromptManagerDialog(QDialog):
                     slot_key,
                     data.get("name", "Error"),
                     data.get("text", ""),
-                    data.get("thumbnail_path")
+                    data.get("thumbnail_path"),
+                    defer_thumbnail=True
                 )
+        self.scroll_area.setWidget(self.scroll_widget)
+        if sorted_slots:
+            # Thumbnails are started once the entries are laid out, and only for
+            # those inside the viewport (see _load_visible_thumbnails)
+            self._visible_thumbs_timer.start()
 
         self._update_action_buttons()
 
 
-    def _create_and_add_prompt_widget(self, slot_key: str, name: str, text: str, relative_thumb_filename: Optional[str]):
+    def _create_and_add_prompt_widget(self, slot_key: str, name: str, text: str, relative_thumb_filename: Optional[str],
+                                      defer_thumbnail: bool = False, layout_index: Optional[int] = None):
         """Creates a PromptEntryWidget, connects its signals, and adds it to the layout."""
         widget = PromptEntryWidget(
             slot_key,
@@ -521,24 +808,107 @@ class PromptManagerDialog(QDialog):
             text,
             relative_thumb_filename,
             constants.PROMPTS_ASSETS_DIR, # Pass the assets directory path
-            self.scroll_widget
+            self.scroll_widget,
+            defer_thumbnail=defer_thumbnail
         )
-        widget.change_occurred.connect(self._handle_prompt_change)
+        # Tag the editors with their slot so the shared hub can resolve sender() -> slot_key
+        for editor in (widget.name_edit, widget.text_edit):
+            editor.setProperty("slot_key", slot_key)
+            editor.textChanged.connect(self._on_entry_edited)
         widget.clicked.connect(self._handle_prompt_click)
         widget.request_thumbnail.connect(self._handle_thumbnail_request)
 
-        # Insert before the stretch item
-        self.prompts_layout.insertWidget(self.prompts_layout.count() - 1, widget)
+        # Insert before the stretch item (or at the requested position)
+        if layout_index is None:
+            layout_index = self.prompts_layout.count() - 1
+        self.prompts_layout.insertWidget(layout_index, widget)
         self._prompt_widgets[slot_key] = widget
         return widget
 
+    def _sync_prompts_with_service(self):
+        """
+        Brings the entry list in line with PromptService without a full rebuild:
+        removed slots lose their widget, new slots get one, kept entries are updated in place.
+        """
+        prompts_data = self.prompt_service.get_all_prompts_full()
+        sorted_slots = self.prompt_service.get_sorted_slot_keys()
+        old_widgets = self._prompt_widgets
+
+        self.scroll_widget.setUpdatesEnabled(False)
+        try:
+            for slot_key in old_widgets.keys() - prompts_data.keys():
+                widget = old_widgets[slot_key]
+                self.prompts_layout.removeWidget(widget)
+                widget.deleteLater()
+                self._thumbnail_jobs.pop(slot_key, None)
+                if self._selected_slot_key == slot_key:
+                    self._selected_slot_key = None
+
+            self._prompt_widgets = {}
+            for position, slot_key in enumerate(sorted_slots):
+                data = prompts_data[slot_key]
+                name, text, thumb = data.get("name", "Error"), data.get("text", ""), data.get("thumbnail_path")
+                widget = old_widgets.get(slot_key)
+                if widget is None:
+                    # Entries follow the placeholder (layout index 0) in slot order
+                    self._create_and_add_prompt_widget(slot_key, name, text, thumb,
+                                                       defer_thumbnail=True, layout_index=position + 1)
+                else:
+                    widget.set_data(name, text, thumb)
+                    if self.prompts_layout.indexOf(widget) != position + 1: # e.g. a slot added mid-range
+                        self.prompts_layout.removeWidget(widget)
+                        self.prompts_layout.insertWidget(position + 1, widget)
+                    self._prompt_widgets[slot_key] = widget
+            self.placeholder_label.setVisible(not self._prompt_widgets)
+        finally:
+            self.scroll_widget.setUpdatesEnabled(True)
+
+        self._pending_change_slots.clear()
+        self._dirty_slots.clear()
+        self._is_dirty = False # The view now matches the saved state
+        self._visible_thumbs_timer.start()
+
+
+
 
+    @pyqtSlot()
+    def _schedule_visible_thumbnails(self):
+        """Restarts the debounce that realizes thumbnails after scrolling or relayout."""
+        self._visible_thumbs_timer.start()
 
+    @pyqtSlot()
+    def _load_visible_thumbnails(self):
+        """Starts thumbnail loads for deferred entries within one viewport of the visible area."""
+        viewport_height = self.scroll_area.viewport().height()
+        top = self.scroll_area.verticalScrollBar().value() - viewport_height
+        bottom = top + 3 * viewport_height
+        for widget in self._prompt_widgets.values():
+            if widget.is_thumbnail_pending():
+                geometry = widget.geometry()
+                if geometry.bottom() >= top and geometry.top() <= bottom:
+                    widget.load_thumbnail()
 
     # --- Signal Handlers for PromptEntryWidget ---
+    @pyqtSlot()
+    def _on_entry_edited(self):
+        """Shared textChanged hub for all entries; debounces into _handle_prompt_change."""
+        sender = self.sender()
+        slot_key = sender.property("slot_key") if sender is not None else None
+        if slot_key:
+            self._pending_change_slots.add(slot_key)
+            self._change_timer.start()
+
+    @pyqtSlot()
+    def _flush_pending_changes(self):
+        """Reports every slot edited since the last flush."""
+        pending, self._pending_change_slots = self._pending_change_slots, set()
+        for slot_key in pending:
+            self._handle_prompt_change(slot_key)
+
     @pyqtSlot(str)
     def _handle_prompt_change(self, slot_key: str):
         """Marks the dialog as dirty when a prompt entry changes."""
+        self._dirty_slots.add(slot_key)
         if not self._is_dirty:
             log_debug(f"Change detected in {slot_key}. Marking dialog as dirty.")
             self._is_dirty = True
@@ -551,19 +921,38 @@ class PromptManagerDialog(QDialog):
         if self._selected_slot_key == slot_key:
             return # No change
 
-        # Deselect previous
-        if self._selected_slot_key and self._selected_slot_key in self._prompt_widgets:
-            self._prompt_widgets[self._selected_slot_key].set_selected(False)
-
-        # Select new
-        self._selected_slot_key = slot_key
-        if slot_key in self._prompt_widgets:
-            self._prompt_widgets[slot_key].set_selected(True)
-            # Scroll to ensure the selected item is visible
-            QTimer.singleShot(0, lambda w=self._prompt_widgets[slot_key]: self.scroll_area.ensureWidgetVisible(w, yMargin=10))
+        # Restyle old and new entry together so they repaint in a single pass
+        self.scroll_widget.setUpdatesEnabled(False)
+        try:
+            # Deselect previous
+            if self._selected_slot_key and self._selected_slot_key in self._prompt_widgets:
+                self._prompt_widgets[self._selected_slot_key].set_selected(False)
+
+            # Select new
+            self._selected_slot_key = slot_key
+            if slot_key in self._prompt_widgets:
+                self._prompt_widgets[slot_key].set_selected(True)
+                # Scroll to ensure the selected item is visible (coalesced across rapid clicks)
+                self._pending_scroll_timer.start()
+        finally:
+            self.scroll_widget.setUpdatesEnabled(True)
 
         self._update_action_buttons() # Update Delete/Load button states
 
+    @pyqtSlot()
+    def _apply_pending_selection(self):
+        """Selects the entry queued by the last external update (once per burst)."""
+        slot_key, self._pending_select_key = self._pending_select_key, None
+        if slot_key and slot_key in self._prompt_widgets:
+            self._handle_prompt_click(slot_key)
+
+    @pyqtSlot()
+    def _scroll_to_selected(self):
+        """Scrolls the prompt list so the currently selected entry is visible."""
+        widget = self._prompt_widgets.get(self._selected_slot_key) if self._selected_slot_key else None
+        if widget is not None:
+            self.scroll_area.ensureWidgetVisible(widget, yMargin=10)
+
 
 
 
@@ -597,53 +986,31 @@ class PromptManagerDialog(QDialog):
             new_thumb_filename = f"{slot_key}.png" # Standardized filename
             new_thumb_full_path = constants.PROMPTS_ASSETS_DIR / new_thumb_filename
 
-            # --- Delete Old Thumbnail File (if it exists) ---
-            if relative_thumb_filename:
-                thumb_file_path = constants.PROMPTS_ASSETS_DIR / relative_thumb_filename
-                if thumb_file_path.is_file():
-                    try:
-                        thumb_file_path.unlink()
-                        log_info(f"Deleted old thumbnail file: {thumb_file_path}")
-                    except OSError as e:
-                        log_error(f"Error deleting old thumbnail file {thumb_file_path}: {e}")
-                        # Show error but continue deleting prompt data? Maybe.
-                        show_error_message(self, "Thumbnail Error", f"Could not delete the old thumbnail file:\n{thumb_file_path}\n{e}")
-                else:
-                    log_debug(f"Old thumbnail file path found in data ('{relative_thumb_filename}'), but file doesn't exist at {thumb_file_path}, skipping deletion.")
-
             # --- Create and Save New Thumbnail ---
             log_info(f"Creating thumbnail for {slot_key} from {selected_original_path.name} -> {new_thumb_full_path}")
             try:
                 constants.PROMPTS_ASSETS_DIR.mkdir(parents=True, exist_ok=True)
-                # Generate thumbnail bytes (use desired larger size like 256x256, consistent with PromptService)
-                thumb_bytes = ImageProcessor.create_thumbnail_bytes(selected_original_path, size=(256, 256))
-
-                if thumb_bytes:
-                    new_thumb_full_path.write_bytes(thumb_bytes)
-                    log_info(f"Successfully saved new thumbnail file: {new_thumb_full_path}")
-
-                    # --- ADD THIS LINE: Update PromptService memory with the new thumbnail path ---
-                    # Use the current name and text from the widget, as these might have been edited.
-                    self.prompt_service.update_prompt_data_in_memory(slot_key, current_name, current_text, new_thumb_filename)
-                    # --- END ADD ---
-
-                    # Now update the widget itself (this also emits change_occurred)
-                    widget.set_relative_thumbnail_filename(new_thumb_filename)
-
-                else:
-                    log_error(f"Failed to create thumbnail bytes from {selected_original_path.name}")
-                    show_error_message(self, "Thumbnail Error", f"Could not process the selected image:\n{selected_original_path.name}")
-                    # If thumbnail creation failed, update memory to reflect no thumbnail
-                    self.prompt_service.update_prompt_data_in_memory(slot_key, current_name, current_text, None)
-                    widget.set_relative_thumbnail_filename(None)
-
-
+                copy_as_is = self._is_display_sized_png(selected_original_path)
+                if copy_as_is:
+                    # Already a small PNG: store it as-is, skipping decode/resample/encode
+                    if selected_original_path.resolve() != new_thumb_full_path.resolve():
+                        shutil.copyfile(selected_original_path, new_thumb_full_path)
+                    log_info(f"Copied display-sized PNG as thumbnail: {new_thumb_full_path}")
             except Exception as e:
                 log_error(f"Error creating/saving thumbnail {new_thumb_filename}: {e}", exc_info=True)
                 show_error_message(self, "Thumbnail Error", f"Could not create or save the thumbnail:\n{e}")
-                # If an error occurred, update memory to reflect no thumbnail
-                self.prompt_service.update_prompt_data_in_memory(slot_key, current_name, current_text, None)
-                widget.set_relative_thumbnail_filename(None)
+                return
+            if copy_as_is:
+                self._thumbnail_jobs.pop(slot_key, None) # Supersedes any build still running
+                self._apply_new_thumbnail(slot_key, relative_thumb_filename, new_thumb_filename)
+                return
+
+            # Decode/resample/encode on the thread pool; the file is written on completion
+            self._thumbnail_job_token += 1
+            self._thumbnail_jobs[slot_key] = (self._thumbnail_job_token, relative_thumb_filename, selected_original_path.name)
+            task = _ThumbnailCreateTask(self._thumbnail_job_token, slot_key, selected_original_path)
+            task.signals.created.connect(self._on_thumbnail_created, Qt.ConnectionType.QueuedConnection)
+            QThreadPool.globalInstance().start(task)
 
         else:
             log_debug(f"Thumbnail selection cancelled for {slot_key}.")
@@ -652,6 +1019,70 @@ class PromptManagerDialog(QDialog):
 
 
 
+    @staticmethod
+    def _is_display_sized_png(image_path: Path) -> bool:
+        """True if the file is a PNG that already fits PROMPT_THUMBNAIL_SIZE (header read only)."""
+        reader = QImageReader(str(image_path))
+        size = reader.size()
+        max_width, max_height = constants.PROMPT_THUMBNAIL_SIZE
+        return (bytes(reader.format()).lower() == b"png" and size.isValid()
+                and size.width() <= max_width and size.height() <= max_height)
+
+    @pyqtSlot(int, str, object)
+    def _on_thumbnail_created(self, token: int, slot_key: str, thumb_bytes: Optional[bytes]):
+        """Writes a thumbnail produced by _ThumbnailCreateTask and points the entry at it."""
+        job = self._thumbnail_jobs.get(slot_key)
+        if job is None or job[0] != token:
+            return # Entry removed, or a newer selection superseded this one
+        del self._thumbnail_jobs[slot_key]
+        _, old_thumb_filename, source_name = job
+        if slot_key not in self._prompt_widgets:
+            return
+        if not thumb_bytes:
+            log_error(f"Failed to create thumbnail bytes from {source_name}")
+            show_error_message(self, "Thumbnail Error", f"Could not process the selected image:\n{source_name}")
+            return
+
+        new_thumb_filename = f"{slot_key}.png"
+        new_thumb_full_path = constants.PROMPTS_ASSETS_DIR / new_thumb_filename
+        try:
+            new_thumb_full_path.write_bytes(thumb_bytes)
+        except OSError as e:
+            log_error(f"Error saving thumbnail {new_thumb_filename}: {e}", exc_info=True)
+            show_error_message(self, "Thumbnail Error", f"Could not create or save the thumbnail:\n{e}")
+            return
+        log_info(f"Successfully saved new thumbnail file: {new_thumb_full_path}")
+        self._apply_new_thumbnail(slot_key, old_thumb_filename, new_thumb_filename)
+        if not self.isVisible():
+            # Finished after the dialog closed: reject() has already saved, so nothing
+            # else would write this change. The entry is in PromptService memory now.
+            log_info(f"Thumbnail for {slot_key} finished after close; saving prompts.")
+            self.prompt_service.save_all_prompts_async()
+            self._dirty_slots.discard(slot_key)
+            self._is_dirty = bool(self._dirty_slots)
+
+    def _apply_new_thumbnail(self, slot_key: str, old_thumb_filename: Optional[str], new_thumb_filename: str):
+        """Removes a differently named old thumbnail and records the new one in memory and on the entry."""
+        # --- Delete Old Thumbnail File (if it exists and wasn't just overwritten) ---
+        if old_thumb_filename and old_thumb_filename != new_thumb_filename:
+            thumb_file_path = constants.PROMPTS_ASSETS_DIR / old_thumb_filename
+            try:
+                thumb_file_path.unlink() # No is_file() pre-check: a missing file surfaces as FileNotFoundError
+                log_info(f"Deleted old thumbnail file: {thumb_file_path}")
+            except FileNotFoundError:
+                log_debug(f"Old thumbnail file path found in data ('{old_thumb_filename}'), but file doesn't exist at {thumb_file_path}, skipping deletion.")
+            except OSError as e:
+                log_error(f"Error deleting old thumbnail file {thumb_file_path}: {e}")
+                show_error_message(self, "Thumbnail Error", f"Could not delete the old thumbnail file:\n{thumb_file_path}\n{e}")
+
+        widget = self._prompt_widgets[slot_key]
+        # Use the current name and text from the widget, as these might have been edited.
+        current_name, current_text, _ = widget.get_data()
+        self.prompt_service.update_prompt_data_in_memory(slot_key, current_name, current_text, new_thumb_filename)
+        widget.set_relative_thumbnail_filename(new_thumb_filename)
+        self._handle_prompt_change(slot_key)
+
+    @pyqtSlot()
     def _add_prompt(self):
         """Adds a new prompt entry."""
         log_info("Adding new prompt.")
@@ -691,7 +1122,7 @@ class PromptManagerDialog(QDialog):
             return
 
         widget_to_delete = self._prompt_widgets[self._selected_slot_key]
-        prompt_name, _, relative_thumb_filename = widget_to_delete.get_data() # Get relative filename
+        prompt_name, relative_thumb_filename = widget_to_delete.get_name_and_thumbnail() # Get relative filename
 
         reply = QMessageBox.question(self, "Confirm Delete",
                                      f"Are you sure you want to delete the prompt\n'{prompt_name}' ({self._selected_slot_key})?\n\nThis action only takes effect after clicking 'Save All Changes'.",
@@ -704,16 +1135,15 @@ class PromptManagerDialog(QDialog):
             # --- Delete Associated Thumbnail File ---
             if relative_thumb_filename:
                 thumb_file_path = constants.PROMPTS_ASSETS_DIR / relative_thumb_filename
-                if thumb_file_path.is_file():
-                    try:
-                        thumb_file_path.unlink()
-                        log_info(f"Deleted associated thumbnail file: {thumb_file_path}")
-                    except OSError as e:
-                        log_error(f"Error deleting thumbnail file {thumb_file_path}: {e}")
-                        # Show error but continue deleting prompt data? Maybe.
-                        show_error_message(self, "Delete Error", f"Could not delete thumbnail file:\n{thumb_file_path}\n{e}")
-                else:
+                try:
+                    thumb_file_path.unlink() # No is_file() pre-check: a missing file surfaces as FileNotFoundError
+                    log_info(f"Deleted associated thumbnail file: {thumb_file_path}")
+                except FileNotFoundError:
                     log_warning(f"Thumbnail file '{relative_thumb_filename}' for {self._selected_slot_key} not found at {thumb_file_path}, skipping deletion.")
+                except OSError as e:
+                    log_error(f"Error deleting thumbnail file {thumb_file_path}: {e}")
+                    # Show error but continue deleting prompt data? Maybe.
+                    show_error_message(self, "Delete Error", f"Could not delete thumbnail file:\n{thumb_file_path}\n{e}")
             else:
                 log_debug(f"No associated thumbnail file to delete for {self._selected_slot_key}.")
 
@@ -722,6 +1152,7 @@ class PromptManagerDialog(QDialog):
                  # Remove widget
                  widget_to_delete.deleteLater()
                  del self._prompt_widgets[self._selected_slot_key]
+                 self._thumbnail_jobs.pop(self._selected_slot_key, None) # A reused slot key must not pick it up
                  self._selected_slot_key = None
 
                  # Show placeholder if needed
@@ -749,8 +1180,12 @@ class PromptManagerDialog(QDialog):
             return
 
         # Get selected prompt text
-        selected_widget = self._prompt_widgets[self._selected_slot_key]
-        self._selected_prompt_to_load = selected_widget.get_data()[1] # Get text
+        slot_key = self._selected_slot_key
+        if slot_key in self._dirty_slots or slot_key in self._pending_change_slots:
+            self._selected_prompt_to_load = self._prompt_widgets[slot_key].get_data()[1] # Edited: read the editor
+        else:
+            # Unchanged: use the service's copy instead of copying the editor's text out
+            self._selected_prompt_to_load = (self.prompt_service.get_prompt_text(slot_key) or "").strip()
 
         # Determine target
         if self.current_mode == "Multi":
@@ -789,43 +1224,39 @@ class PromptManagerDialog(QDialog):
         # Load button logic
         can_load = has_selection
         if self.current_mode == "Multi":
-            # Check if any loadable target exists
-            has_loadable_target = False
-            for i in range(self.target_list_widget.count()):
-                item = self.target_list_widget.item(i)
-                if item and (item.flags() & Qt.ItemFlag.ItemIsEnabled):
-                    has_loadable_target = True
-                    break
-            if not has_loadable_target:
+            # Disabled targets never change while the dialog is open, so this is cached
+            if not self._has_loadable_target:
                 can_load = False # Disable load if no target available
         self.load_button.setEnabled(can_load)
 
         # Update wildcard insert buttons (enable only if a prompt is selected)
-        for i in range(self.wildcard_button_layout.count()):
-             item = self.wildcard_button_layout.itemAt(i)
-             widget = item.widget()
-             if isinstance(widget, QPushButton):
-                  widget.setEnabled(has_selection)
+        if has_selection != self._wildcards_enabled:
+            for button in self._wildcard_buttons:
+                button.setEnabled(has_selection)
+            self._wildcards_enabled = has_selection
 
 
+    @pyqtSlot()
     def reject(self):
         """Saves changes automatically and closes the dialog."""
         log_info("Prompt Manager close requested. Saving changes automatically...")
 
-        # Always attempt to save changes if dialog is closed, regardless of _is_dirty flag
-        # First, update the in-memory data in PromptService from the widgets
-        errors = []
-        for slot_key, widget in self._prompt_widgets.items():
-            name, text, thumb_path = widget.get_data()
-            # Also handle the case where the widget was marked for deletion in _delete_prompt
-            # Only attempt to update in-memory if the slot key still exists in the service's internal dict
-            # The remove_prompt method removes from _prompts dictionary
-            if slot_key in self.prompt_service._prompts: # Check internal dict
-                 if not self.prompt_service.update_prompt_data_in_memory(slot_key, name, text, thumb_path):
-                    errors.append(f"Failed to update data for {slot_key} ('{name}') in memory before saving.")
-            # If the slot_key is NOT in self.prompt_service._prompts, it means it was marked for deletion,
-            # so we don't try to update it in memory before saving.
-
+        # Edits still inside the debounce window count as changes too
+        self._change_timer.stop()
+        self._flush_pending_changes()
+        # Every change path (edit, thumbnail, add, delete) sets _is_dirty; nothing to write otherwise.
+        # Thumbnails still building count too: their completion saves again if the dialog is hidden.
+        if not self._is_dirty and not self._dirty_slots and not self._thumbnail_jobs:
+            log_debug("Prompt Manager closed without changes; skipping save.")
+            super().reject()
+            return
+        # First, copy the edited entries (only) back into PromptService memory in one batch.
+        # Slots deleted in _delete_prompt have no widget and are skipped by the service too.
+        updates = {slot_key: self._prompt_widgets[slot_key].get_data()
+                   for slot_key in self._dirty_slots if slot_key in self._prompt_widgets}
+        failed_slots = self.prompt_service.update_prompts_bulk(updates)
+        errors = [f"Failed to update data for {slot_key} ('{updates[slot_key][0]}') in memory before saving."
+                  for slot_key in failed_slots]
 
         if errors:
             log_error(f"Errors occurred updating prompt data in memory before closing: {errors}")
@@ -836,34 +1267,18 @@ class PromptManagerDialog(QDialog):
         try:
             # The save_all_prompts method should handle saving the *current state* of self.prompt_service._prompts
             # Which includes additions, updates, and deletions performed in memory.
-            if self.prompt_service.save_all_prompts():
-                self._is_dirty = False # Reset dirty flag on successful save
-                log_info("Prompt changes saved successfully on close.")
-                # No success message popup.
-            else:
-                log_error("Failed to write changes to the prompts file on close.")
-                # No failure message popup.
+            # The write runs on the thread pool so closing doesn't wait on disk I/O;
+            # the service logs the outcome (no popups either way).
+            self.prompt_service.save_all_prompts_async()
+            self._is_dirty = False # Changes are now in PromptService memory
+            self._dirty_slots.clear()
+            log_info("Prompt changes handed off for saving on close.")
         except AttributeError:
-             log_critical("PromptService.save_all_prompts is missing! Prompt changes were NOT saved.", exc_info=True)
+             log_critical("PromptService.save_all_prompts_async is missing! Prompt changes were NOT saved.", exc_info=True)
              # Fatal error for save, but still close the dialog as requested.
         except Exception as e:
              log_critical(f"Unexpected error during prompt save on close: {e}", exc_info=True)
 
-        # --- ADD THIS BLOCK ---
-        # Disconnect the signal from PromptService to prevent crashes
-        try:
-            if hasattr(self.prompt_service, 'prompts_updated') and hasattr(self, '_handle_external_prompt_update'):
-                # We need the specific bound method reference to disconnect
-                # This assumes the connection was made using a direct method reference
-                # like: self.prompt_service.prompts_updated.connect(self._handle_external_prompt_update)
-                self.prompt_service.prompts_updated.disconnect(self._handle_external_prompt_update)
-                log_debug("Disconnected prompt_service.prompts_updated from PromptManagerDialog on close.")
-            # If the connection was made via lambda or partial, disconnecting might be harder
-            # or require storing the connection object, but direct method connection is best practice here.
-        except (TypeError, RuntimeError) as e:
-            log_warning(f"Error disconnecting prompt service signal from PromptManagerDialog: {e}")
-        # --- END ADD BLOCK ---
-
         log_debug("Prompt Manager finished save attempt, closing dialog.")
         super().reject() # Always close after attempting save
 
@@ -872,21 +1287,33 @@ class PromptManagerDialog(QDialog):
          """Ensures reject logic is called when closing via window [X]."""
          # The reject method now handles saving automatically without prompting
          self.reject()
-         # Check if reject() prevented closing (by returning without calling super().reject())
-         # In this case, reject() *always* calls super().reject() after saving,
-         # so we always accept the close event here.
+         # Always accept the close event after calling reject, as reject handles the user decision
          event.accept()
 
+    def showEvent(self, event):
+        """Starts listening for external prompt saves while the dialog is shown."""
+        self._connect_service_signal(self.prompt_service.prompts_updated, self._handle_external_prompt_update)
+        super().showEvent(event)
 
-    def closeEvent(self, event):
-         """Ensures reject logic is called when closing via window [X]."""
-         # The reject method now handles saving automatically without prompting
-         self.reject()
-         # Always accept the close event after calling reject, as reject handles the user decision
-         event.accept()
-             
-              
+    def done(self, result: int):
+        """Drops every tracked service connection whenever the dialog finishes (accept, reject or close)."""
+        self._disconnect_service_signals()
+        super().done(result)
 
+    def _connect_service_signal(self, signal, slot):
+        """Connects signal -> slot once and remembers the connection for _disconnect_service_signals."""
+        if any(tracked_slot == slot for _, tracked_slot, _ in self._service_connections):
+            return
+        self._service_connections.append((signal, slot, signal.connect(slot)))
+
+    def _disconnect_service_signals(self):
+        """Disconnects everything made through _connect_service_signal."""
+        connections, self._service_connections = self._service_connections, []
+        for signal, _, connection in connections:
+            try:
+                signal.disconnect(connection)
+            except (TypeError, RuntimeError) as e:
+                log_warning(f"Error disconnecting prompt service signal from PromptManagerDialog: {e}")
 
     @pyqtSlot()
     def _handle_external_prompt_update(self):
@@ -897,31 +1324,25 @@ class PromptManagerDialog(QDialog):
         # Just silently reload the prompts from the service.
         # This updates the dialog's view to match the saved state if an external save occurred.
 
-        log_info("Silently reloading prompts in manager due to external update.")
-        # Store current selection to try and restore it after reload
-        current_key_to_restore = self._selected_slot_key
-
-        # Reload the prompts list from the service (which reads the updated file)
-        # This will clear and recreate all widgets based on the new data
-        self._load_prompts() # This method correctly clears _is_dirty and updates the UI
+        log_info("Silently syncing prompts in manager due to external update.")
+        # Update entries in place: only added/removed slots create/destroy widgets
+        self._sync_prompts_with_service()
 
-        # Try to restore selection if the slot key still exists after reload
-        if current_key_to_restore and current_key_to_restore in self._prompt_widgets:
-             log_debug(f"Attempting to restore selection to {current_key_to_restore}")
-             # Use QTimer to ensure selection happens after layout updates are processed
-             # Pass the key to the selection handler
-             QTimer.singleShot(0, lambda key=current_key_to_restore: self._handle_prompt_click(key))
+        # Keep the current selection if its slot survived; otherwise select the first entry
+        if self._selected_slot_key in self._prompt_widgets:
+             self._update_action_buttons()
         elif self._prompt_widgets:
              # If the previously selected slot is gone or no previous selection,
              # select the first item if the list is not empty.
              first_key = next(iter(self._prompt_widgets.keys()), None)
              if first_key:
                  log_debug("Previous selection lost or none selected, selecting first item.")
-                 QTimer.singleShot(0, lambda key=first_key: self._handle_prompt_click(key))
+                 self._pending_select_key = first_key
+                 self._pending_select_timer.start()
         else:
              # The prompt list is now empty
              self._selected_slot_key = None
              self._update_action_buttons() # Ensure buttons are correctly disabled if the list is empty
 
         # No need to emit patterns_updated or mark as dirty here - this signal indicates a change has
-        # *already* been saved externally, and _load_prompts resets the dirty state internally.
\ No newline at end of file
+        # *already* been saved externally, and _sync_prompts_with_service resets the dirty state.
\ No newline at end of file
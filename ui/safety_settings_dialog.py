@@ -7,6 +7,7 @@ from PyQt6.QtWidgets import (
     QLabel, QSizePolicy
 )
 from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QStandardItemModel, QStandardItem
 
 # --- Project Imports ---
 from utils.logger import log_debug, log_warning, log_error
@@ -49,6 +50,29 @@ except ImportError:
     AVAILABLE_HARM_CATEGORIES = []
     AVAILABLE_THRESHOLDS = [("API Default (Unspecified)", None)]
 
+_UNSPECIFIED_THRESHOLD = google_types.HarmBlockThreshold.HARM_BLOCK_THRESHOLD_UNSPECIFIED
+
+# Threshold enum -> row in AVAILABLE_THRESHOLDS (and so in every threshold combo)
+_THRESHOLD_INDEX = {thresh_enum: i for i, (_, thresh_enum) in enumerate(AVAILABLE_THRESHOLDS)}
+_UNSPECIFIED_THRESHOLD_INDEX = _THRESHOLD_INDEX.get(_UNSPECIFIED_THRESHOLD, 0)
+
+# One threshold item model shared by every category combo (and every dialog open);
+# built on first use, since it must be created after the QApplication exists.
+_shared_threshold_model: Optional[QStandardItemModel] = None
+
+
+def _get_shared_threshold_model() -> QStandardItemModel:
+    """Returns the shared (name, enum-in-UserRole) model for the threshold combos."""
+    global _shared_threshold_model
+    if _shared_threshold_model is None:
+        _shared_threshold_model = QStandardItemModel()
+        for thresh_name, thresh_enum in AVAILABLE_THRESHOLDS:
+            item = QStandardItem(thresh_name)
+            item.setData(thresh_enum, Qt.ItemDataRole.UserRole) # Same role addItem(text, data) uses
+            _shared_threshold_model.appendRow(item)
+    return _shared_threshold_model
+
+
 class SafetySettingsDialog(QDialog):
     """Dialog for configuring content safety settings."""
 
@@ -93,22 +117,27 @@ class SafetySettingsDialog(QDialog):
 
         # Create a combo box for each harm category
         if SDK_TYPES_AVAILABLE:
-             for display_name, category_enum in AVAILABLE_HARM_CATEGORIES:
-                 # Sanitize the category name for use in an object name
-                 safe_category_name = category_enum.name.replace("HARM_CATEGORY_", "").lower()
-
-                 category_label = QLabel(f"{display_name}:") # Create label explicitly if needed for styling
-                 category_label.setObjectName(f"label_{safe_category_name}")
-
-                 combo = QComboBox()
-                 combo.setObjectName(f"combo_{safe_category_name}") # e.g., combo_hate_speech
-                 combo.setToolTip(f"Set blocking threshold for {display_name} content.")
-                 for thresh_name, thresh_enum in AVAILABLE_THRESHOLDS:
-                     combo.addItem(thresh_name, thresh_enum) # Store enum value as data
-
-                 self._category_combos[category_enum] = combo
-                 # form_layout.addRow(f"{display_name}:", combo) # Original
-                 form_layout.addRow(category_label, combo) # Use label widget
+             threshold_model = _get_shared_threshold_model()
+             settings_group.setUpdatesEnabled(False) # Add all rows, then lay out/paint once
+             try:
+                 for display_name, category_enum in AVAILABLE_HARM_CATEGORIES:
+                     # Sanitize the category name for use in an object name
+                     safe_category_name = category_enum.name.replace("HARM_CATEGORY_", "").lower()
+
+                     category_label = QLabel(f"{display_name}:") # Create label explicitly if needed for styling
+                     category_label.setObjectName(f"label_{safe_category_name}")
+
+                     combo = QComboBox()
+                     combo.setObjectName(f"combo_{safe_category_name}") # e.g., combo_hate_speech
+                     combo.setToolTip(f"Set blocking threshold for {display_name} content.")
+                     combo.setModel(threshold_model) # Shared, read-only items; each combo keeps its own current index
+
+                     self._category_combos[category_enum] = combo
+                     # form_layout.addRow(f"{display_name}:", combo) # Original
+                     form_layout.addRow(category_label, combo) # Use label widget
+             finally:
+                 settings_group.setUpdatesEnabled(True)
+                 settings_group.adjustSize()
 
         else:
              # Show disabled message if SDK types not available
@@ -143,15 +172,13 @@ class SafetySettingsDialog(QDialog):
 
         log_debug(f"Loading safety settings into dialog: {self._initial_settings}")
         for category_enum, combo in self._category_combos.items():
-            current_threshold = self._initial_settings.get(category_enum, google_types.HarmBlockThreshold.HARM_BLOCK_THRESHOLD_UNSPECIFIED) # Default to Unspecified
-            index = combo.findData(current_threshold)
-            if index != -1:
-                combo.setCurrentIndex(index)
-            else:
+            current_threshold = self._initial_settings.get(category_enum, _UNSPECIFIED_THRESHOLD) # Default to Unspecified
+            index = _THRESHOLD_INDEX.get(current_threshold)
+            if index is None:
                 # If the stored value isn't in our list (shouldn't happen), default to Unspecified
                 log_warning(f"Could not find threshold '{current_threshold}' in combo box for category '{category_enum}'. Defaulting.")
-                index_unspecified = combo.findData(google_types.HarmBlockThreshold.HARM_BLOCK_THRESHOLD_UNSPECIFIED)
-                combo.setCurrentIndex(index_unspecified if index_unspecified != -1 else 0)
+                index = _UNSPECIFIED_THRESHOLD_INDEX
+            combo.setCurrentIndex(index)
 
     def _connect_signals(self):
         """Connect signals."""
@@ -166,27 +193,21 @@ class SafetySettingsDialog(QDialog):
         if not SDK_TYPES_AVAILABLE:
             return
         log_debug("Resetting safety settings to API defaults.")
-        default_enum = google_types.HarmBlockThreshold.HARM_BLOCK_THRESHOLD_UNSPECIFIED
         for combo in self._category_combos.values():
-            index = combo.findData(default_enum)
-            if index != -1:
-                combo.setCurrentIndex(index)
+            combo.setCurrentIndex(_UNSPECIFIED_THRESHOLD_INDEX)
 
     def get_selected_settings(self) -> Optional[Dict[google_types.HarmCategory, google_types.HarmBlockThreshold]]:
         """Returns the configured settings as a dictionary."""
         if not SDK_TYPES_AVAILABLE:
             return None
 
-        selected: Dict[google_types.HarmCategory, google_types.HarmBlockThreshold] = {}
-        for category_enum, combo in self._category_combos.items():
-            threshold_enum = combo.currentData() # Get the stored enum value
-            # Only include settings that are *not* unspecified (API default)
-            if threshold_enum != google_types.HarmBlockThreshold.HARM_BLOCK_THRESHOLD_UNSPECIFIED:
-                 if isinstance(threshold_enum, google_types.HarmBlockThreshold): # Basic type check
-                     selected[category_enum] = threshold_enum
-                 else:
-                      log_error(f"Invalid data type found in safety combo box for {category_enum}: {type(threshold_enum)}")
-
+        # Only include settings that are *not* unspecified (API default).
+        # The combos share the threshold model, so currentData() is always a valid enum.
+        selected: Dict[google_types.HarmCategory, google_types.HarmBlockThreshold] = {
+            category_enum: threshold_enum
+            for category_enum, combo in self._category_combos.items()
+            if (threshold_enum := combo.currentData()) is not None and threshold_enum != _UNSPECIFIED_THRESHOLD
+        }
         return selected if selected else None # Return None if all are unspecified
 
     def accept(self):
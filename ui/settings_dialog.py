@@ -1,20 +1,51 @@
 # -*- coding: utf-8 -*-
 
+from typing import Optional
+
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QFormLayout, QComboBox, QCheckBox, QSpinBox,
     QDialogButtonBox, QGroupBox, QLabel, QPushButton, QHBoxLayout
 )
-from PyQt6.QtCore import Qt, pyqtSlot
+from PyQt6.QtCore import Qt, QTimer, QSignalBlocker, pyqtSlot
+from PyQt6.QtGui import QStandardItemModel, QStandardItem
 
 # --- Project Imports ---
-from .filename_pattern_manager_dialog import FilenamePatternManagerDialog
-from .components.filename_settings_widget import FilenameSettingsWidget
 from utils import constants
 from core.settings_service import SettingsService
-from utils.logger import log_debug, log_info
-from utils.helpers import discover_custom_themes
+from utils.logger import log_debug, log_info, log_warning
 from utils.helpers import discover_custom_themes
 
+BUILT_IN_THEMES = ["Auto", "Light", "Dark"]
+
+# Plain settings shown as widgets; _setup_ui, _load_settings and accept all work from these tables.
+# (attribute, object name, text, tooltip, setting key, default)
+_CHECKBOX_SETTINGS = (
+    ("logging_checkbox", "loggingCheckboxSettingsDialog", "Enable Logging",
+     "Enable detailed logging to file and console.",
+     "logging_enabled", constants.DEFAULT_LOGGING_ENABLED),
+    ("auto_save_checkbox", "autoSaveCheckboxSettingsDialog", "Enable Auto-Save",
+     "Automatically save generated images/text to the 'output' folder.",
+     "auto_save_enabled", constants.DEFAULT_AUTO_SAVE_ENABLED),
+    ("save_text_file_checkbox", "saveTextFileCheckboxSettingsDialog", "Save Text File with Image",
+     "Save a .txt file containing prompts and info alongside the generated image.",
+     constants.SAVE_TEXT_FILE_ENABLED, constants.DEFAULT_SAVE_TEXT_FILE_ENABLED),
+    ("embed_metadata_checkbox", "embedMetadataCheckboxSettingsDialog", "Embed Prompts in Image Metadata",
+     "Embed unresolved and resolved prompts into the image's metadata (PNG/JPEG).",
+     constants.EMBED_METADATA_ENABLED, constants.DEFAULT_EMBED_METADATA_ENABLED),
+)
+# (attribute, object name prefix, row label, minimum, maximum, tooltip, in seconds, setting key, default)
+_SPIN_SETTINGS = (
+    ("request_delay_spin", "requestDelay", "Delay Between Requests:", 0, 60,
+     "Delay between consecutive requests (in seconds). Set 0 for no delay.",
+     True, "request_delay", constants.DEFAULT_REQUEST_DELAY),
+    ("retry_count_spin", "retryCount", "Retry Count:", 0, 10,
+     "Number of retries on rate limit or temporary errors.",
+     False, "retry_count", constants.DEFAULT_RETRY_COUNT),
+    ("retry_delay_spin", "retryDelay", "Retry Delay:", 1, 300,
+     "Delay before retrying a failed request (in seconds).",
+     True, "retry_delay", constants.DEFAULT_RETRY_DELAY),
+)
+
 class SettingsDialog(QDialog):
     """Dialog for configuring application settings."""
 
@@ -25,10 +56,27 @@ class SettingsDialog(QDialog):
         self.setWindowTitle("Application Settings")
         self.setMinimumWidth(600)
         self.setMinimumHeight(600)
+        # Widgets are built and filled on first show (see showEvent), not here
+        self._ui_built = False
+        self._populated_patterns_version: Optional[int] = None # settings_service.patterns_version last shown
+        # Pattern string currently in active_pattern_display ("" = label not filled yet; None = no pattern)
+        self._shown_pattern_string: Optional[str] = ""
+
+    def _ensure_built(self):
+        """Builds, loads and wires the dialog UI once."""
+        if self._ui_built:
+            return
         self._setup_ui()
         self._load_settings()
         self._connect_signals()
+        self._ui_built = True
+        # Scan the themes directory once the event loop is free, after the first paint
+        QTimer.singleShot(0, self._load_custom_themes)
 
+    def showEvent(self, event):
+        """Builds the UI on first display, before the window is painted."""
+        self._ensure_built()
+        super().showEvent(event)
 
     def _setup_ui(self):
         # --- Base Dialog ---
@@ -43,35 +91,17 @@ class SettingsDialog(QDialog):
         form_layout.setObjectName("generalFormLayoutSettingsDialog") # Name the form layout
 
         # Theme
-        theme_label = QLabel("Theme:") # Explicit label
-        theme_label.setObjectName("themeLabelSettingsDialog") # Name the label
         self.theme_combo = QComboBox()
         self.theme_combo.setObjectName("themeComboSettingsDialog")
-        form_layout.addRow(theme_label, self.theme_combo) # Add explicit label and combo
-
-        # Logging Checkbox (implicitly includes label)
-        self.logging_checkbox = QCheckBox("Enable Logging")
-        self.logging_checkbox.setObjectName("loggingCheckboxSettingsDialog")
-        self.logging_checkbox.setToolTip("Enable detailed logging to file and console.")
-        form_layout.addRow(self.logging_checkbox) # Checkbox acts as its own label row
-
-        # Auto-Save Checkbox
-        self.auto_save_checkbox = QCheckBox("Enable Auto-Save")
-        self.auto_save_checkbox.setObjectName("autoSaveCheckboxSettingsDialog")
-        self.auto_save_checkbox.setToolTip("Automatically save generated images/text to the 'output' folder.")
-        form_layout.addRow(self.auto_save_checkbox)
-
-        # Save Text File Checkbox
-        self.save_text_file_checkbox = QCheckBox("Save Text File with Image")
-        self.save_text_file_checkbox.setObjectName("saveTextFileCheckboxSettingsDialog")
-        self.save_text_file_checkbox.setToolTip("Save a .txt file containing prompts and info alongside the generated image.")
-        form_layout.addRow(self.save_text_file_checkbox)
-
-        # Embed Metadata Checkbox
-        self.embed_metadata_checkbox = QCheckBox("Embed Prompts in Image Metadata")
-        self.embed_metadata_checkbox.setObjectName("embedMetadataCheckboxSettingsDialog")
-        self.embed_metadata_checkbox.setToolTip("Embed unresolved and resolved prompts into the image's metadata (PNG/JPEG).")
-        form_layout.addRow(self.embed_metadata_checkbox)
+        form_layout.addRow("Theme:", self.theme_combo) # Form layout creates the row label
+
+        # Checkboxes (each acts as its own label row)
+        for attr_name, object_name, text, tooltip, _, _ in _CHECKBOX_SETTINGS:
+            checkbox = QCheckBox(text)
+            checkbox.setObjectName(object_name)
+            checkbox.setToolTip(tooltip)
+            form_layout.addRow(checkbox)
+            setattr(self, attr_name, checkbox) # e.g. self.logging_checkbox
 
         layout.addWidget(general_group)
 
@@ -81,34 +111,14 @@ class SettingsDialog(QDialog):
         req_form_layout = QFormLayout(request_group)
         req_form_layout.setObjectName("requestFormLayoutSettingsDialog") # Name the form layout
 
-        # Request Delay
-        request_delay_label = QLabel("Delay Between Requests:") # Explicit label
-        request_delay_label.setObjectName("requestDelayLabelSettingsDialog") # Name the label
-        self.request_delay_spin = QSpinBox()
-        self.request_delay_spin.setObjectName("requestDelaySpinSettingsDialog")
-        self.request_delay_spin.setRange(0, 60)
-        self.request_delay_spin.setSuffix(" s")
-        self.request_delay_spin.setToolTip("Delay between consecutive requests (in seconds). Set 0 for no delay.")
-        req_form_layout.addRow(request_delay_label, self.request_delay_spin) # Add explicit label and spin
-
-        # Retry Count
-        retry_count_label = QLabel("Retry Count:") # Explicit label
-        retry_count_label.setObjectName("retryCountLabelSettingsDialog") # Name the label
-        self.retry_count_spin = QSpinBox()
-        self.retry_count_spin.setObjectName("retryCountSpinSettingsDialog")
-        self.retry_count_spin.setRange(0, 10)
-        self.retry_count_spin.setToolTip("Number of retries on rate limit or temporary errors.")
-        req_form_layout.addRow(retry_count_label, self.retry_count_spin) # Add explicit label and spin
-
-        # Retry Delay
-        retry_delay_label = QLabel("Retry Delay:") # Explicit label
-        retry_delay_label.setObjectName("retryDelayLabelSettingsDialog") # Name the label
-        self.retry_delay_spin = QSpinBox()
-        self.retry_delay_spin.setObjectName("retryDelaySpinSettingsDialog")
-        self.retry_delay_spin.setRange(1, 300)
-        self.retry_delay_spin.setSuffix(" s")
-        self.retry_delay_spin.setToolTip("Delay before retrying a failed request (in seconds).")
-        req_form_layout.addRow(retry_delay_label, self.retry_delay_spin) # Add explicit label and spin
+        # Spin boxes; delays get an "s" unit label beside them
+        for attr_name, name_prefix, row_label, minimum, maximum, tooltip, in_seconds, _, _ in _SPIN_SETTINGS:
+            spin = QSpinBox()
+            spin.setObjectName(f"{name_prefix}SpinSettingsDialog")
+            spin.setRange(minimum, maximum)
+            spin.setToolTip(tooltip)
+            req_form_layout.addRow(row_label, self._with_seconds_unit(spin, name_prefix) if in_seconds else spin)
+            setattr(self, attr_name, spin) # e.g. self.request_delay_spin
 
         layout.addWidget(request_group)
 
@@ -132,19 +142,15 @@ class SettingsDialog(QDialog):
         pattern_selection_layout.addWidget(self.manage_patterns_button)
 
         # Add the combo+button HBox to the FormLayout
-        active_pattern_label = QLabel("Active Pattern:") # Explicit label
-        active_pattern_label.setObjectName("activePatternLabelSettingsDialog") # Name the label
-        filename_layout.addRow(active_pattern_label, pattern_selection_layout) # Add explicit label and HBox
+        filename_layout.addRow("Active Pattern:", pattern_selection_layout)
 
         # Display the actual pattern string
-        current_pattern_label = QLabel("Current Pattern:") # Explicit label
-        current_pattern_label.setObjectName("currentPatternLabelSettingsDialog") # Name the label
         self.active_pattern_display = QLabel("...")
         self.active_pattern_display.setObjectName("activePatternDisplaySettingsDialog")
         self.active_pattern_display.setWordWrap(True)
         self.active_pattern_display.setStyleSheet("color: grey; font-style: italic;")
         self.active_pattern_display.setToolTip("The actual pattern string for the selected name.")
-        filename_layout.addRow(current_pattern_label, self.active_pattern_display) # Add explicit label and display label
+        filename_layout.addRow("Current Pattern:", self.active_pattern_display)
 
         layout.addWidget(filename_group)
 
@@ -154,11 +160,12 @@ class SettingsDialog(QDialog):
         )
         self.button_box.setObjectName("buttonBoxSettingsDialog") # Name the button box
 
-        # Add object names to standard buttons for potential styling
-        ok_button = self.button_box.button(QDialogButtonBox.StandardButton.Ok)
-        if ok_button: ok_button.setObjectName("okButtonSettingsDialog")
-        cancel_button = self.button_box.button(QDialogButtonBox.StandardButton.Cancel)
-        if cancel_button: cancel_button.setObjectName("cancelButtonSettingsDialog")
+        # Add object names to standard buttons for potential styling (one pass, keyed by role)
+        for button in self.button_box.buttons():
+            if self.button_box.buttonRole(button) == QDialogButtonBox.ButtonRole.AcceptRole:
+                button.setObjectName("okButtonSettingsDialog")
+            else:
+                button.setObjectName("cancelButtonSettingsDialog")
 
         layout.addWidget(self.button_box)
 
@@ -167,68 +174,86 @@ class SettingsDialog(QDialog):
 
 
 
-    def _load_settings(self):
-        self.theme_combo.clear()
-        built_in_themes = ["Auto", "Light", "Dark"]
-        self.theme_combo.addItems(built_in_themes)
+    def _with_seconds_unit(self, spin: QSpinBox, name_prefix: str) -> QHBoxLayout:
+        """Puts a plain-integer spin box next to an "s" unit label (instead of a text suffix)."""
+        row_layout = QHBoxLayout()
+        row_layout.setObjectName(f"{name_prefix}LayoutSettingsDialog")
+        row_layout.addWidget(spin, 1) # Spin box takes the row width, as it did on its own
+        unit_label = QLabel("s")
+        unit_label.setObjectName(f"{name_prefix}UnitLabelSettingsDialog")
+        row_layout.addWidget(unit_label)
+        return row_layout
 
-        custom_themes = discover_custom_themes()
-        if custom_themes:
-            self.theme_combo.insertSeparator(len(built_in_themes))
-            for theme_name, _ in custom_themes:
-                self.theme_combo.addItem(theme_name)
 
+    def _load_settings(self):
         current_theme_setting = self.settings_service.get_setting("theme", constants.DEFAULT_THEME)
-        if not current_theme_setting or self.theme_combo.findText(current_theme_setting) == -1:
-            if current_theme_setting:
-                 log_warning(f"Saved theme '{current_theme_setting}' is invalid or not found in available themes. Defaulting to Auto.")
+        if not current_theme_setting:
             current_theme_setting = constants.DEFAULT_THEME
-        self.theme_combo.setCurrentText(current_theme_setting)
 
-        self.logging_checkbox.setChecked(
-            self.settings_service.get_setting("logging_enabled", constants.DEFAULT_LOGGING_ENABLED)
-        )
-        self.auto_save_checkbox.setChecked(
-            self.settings_service.get_setting("auto_save_enabled", constants.DEFAULT_AUTO_SAVE_ENABLED)
-        )
-        self.request_delay_spin.setValue(
-            self.settings_service.get_setting("request_delay", constants.DEFAULT_REQUEST_DELAY)
-        )
-        self.retry_count_spin.setValue(
-            self.settings_service.get_setting("retry_count", constants.DEFAULT_RETRY_COUNT)
-        )
-        self.retry_delay_spin.setValue(
-            self.settings_service.get_setting("retry_delay", constants.DEFAULT_RETRY_DELAY)
-        )
-        self.save_text_file_checkbox.setChecked(
-            self.settings_service.get_setting(constants.SAVE_TEXT_FILE_ENABLED, constants.DEFAULT_SAVE_TEXT_FILE_ENABLED)
-        )
-        self.embed_metadata_checkbox.setChecked(
-            self.settings_service.get_setting(constants.EMBED_METADATA_ENABLED, constants.DEFAULT_EMBED_METADATA_ENABLED)
-        )
+        # Fill and select in one go, without a currentIndexChanged per mutation
+        with QSignalBlocker(self.theme_combo):
+            self.theme_combo.clear()
+            self.theme_combo.addItems(BUILT_IN_THEMES)
+            if current_theme_setting not in BUILT_IN_THEMES:
+                # Saved custom theme: list it provisionally; _load_custom_themes checks it against disk
+                self.theme_combo.insertSeparator(len(BUILT_IN_THEMES))
+                self.theme_combo.addItem(current_theme_setting)
+            self.theme_combo.setCurrentText(current_theme_setting)
+
+        get_setting = self.settings_service.get_setting
+        for attr_name, *_, key, default in _CHECKBOX_SETTINGS:
+            getattr(self, attr_name).setChecked(get_setting(key, default))
+        for attr_name, *_, key, default in _SPIN_SETTINGS:
+            getattr(self, attr_name).setValue(get_setting(key, default))
         self._populate_pattern_combo()
 
+
+    @pyqtSlot()
+    def _load_custom_themes(self):
+        """Replaces the provisional theme entries with the custom themes found on disk."""
+        custom_themes = discover_custom_themes()
+        selected_theme = self.theme_combo.currentText()
+
+        with QSignalBlocker(self.theme_combo):
+            while self.theme_combo.count() > len(BUILT_IN_THEMES): # Separator + provisional saved theme
+                self.theme_combo.removeItem(self.theme_combo.count() - 1)
+            if custom_themes:
+                self.theme_combo.insertSeparator(len(BUILT_IN_THEMES))
+                for theme_name, _ in custom_themes:
+                    self.theme_combo.addItem(theme_name)
+
+            available_themes = set(BUILT_IN_THEMES).union(theme_name for theme_name, _ in custom_themes)
+            if selected_theme not in available_themes:
+                log_warning(f"Saved theme '{selected_theme}' is invalid or not found in available themes. Defaulting to Auto.")
+                selected_theme = constants.DEFAULT_THEME
+            self.theme_combo.setCurrentText(selected_theme)
     
     
     def _populate_pattern_combo(self):
-         """Helper to load patterns into the combo box."""
+         """Helper to load patterns into the combo box. Skipped while the saved patterns are unchanged."""
+         patterns_version = self.settings_service.patterns_version
+         if patterns_version == self._populated_patterns_version:
+             return
+         self._populated_patterns_version = patterns_version
          log_debug("Populating filename pattern combo box.")
          current_active_name = self.settings_service.get_setting(constants.ACTIVE_FILENAME_PATTERN_NAME_KEY)
          saved_patterns = self.settings_service.get_saved_filename_patterns()
 
-         self.pattern_combo.blockSignals(True)
-         self.pattern_combo.clear()
-
+         # Build the whole model offline, then hand it to the combo in one step
+         sorted_names = self.settings_service.get_sorted_pattern_names()
+         pattern_model = QStandardItemModel(len(sorted_names), 1, self.pattern_combo) # Combo-parented: freed when replaced
          selected_index = 0 # Default to first item
-         sorted_names = sorted(saved_patterns.keys())
          for i, name in enumerate(sorted_names):
-             # Store the pattern string as data associated with the name
-             self.pattern_combo.addItem(name, saved_patterns[name])
+             item = QStandardItem(name)
+             # Store the pattern string as data associated with the name (what currentData() returns)
+             item.setData(saved_patterns[name], Qt.ItemDataRole.UserRole)
+             pattern_model.setItem(i, item)
              if name == current_active_name:
                  selected_index = i
 
-         self.pattern_combo.setCurrentIndex(selected_index)
-         self.pattern_combo.blockSignals(False)
+         with QSignalBlocker(self.pattern_combo): # Restores the signal state even if this raises
+             self.pattern_combo.setModel(pattern_model)
+             self.pattern_combo.setCurrentIndex(selected_index)
          # Update display label manually after loading/setting index
          self._update_active_pattern_display()
 
@@ -236,7 +261,10 @@ class SettingsDialog(QDialog):
     @pyqtSlot()
     def _update_active_pattern_display(self):
          """Updates the read-only label showing the current pattern string."""
-         pattern_string = self.pattern_combo.currentData()
+         pattern_string = self.pattern_combo.currentData() or None
+         if pattern_string == self._shown_pattern_string:
+              return # Same string (e.g. arrowing across equal patterns): skip the relayout
+         self._shown_pattern_string = pattern_string
          if pattern_string:
               self.active_pattern_display.setText(pattern_string)
               self.active_pattern_display.setToolTip(f"Active Pattern: {pattern_string}")
@@ -256,6 +284,8 @@ class SettingsDialog(QDialog):
     @pyqtSlot()
     def _open_filename_pattern_manager(self):
         """Opens the Filename Pattern Manager dialog."""
+        # Imported on first use: most Settings sessions never open the manager
+        from .filename_pattern_manager_dialog import FilenamePatternManagerDialog
         log_info("Opening Filename Pattern Manager dialog.")
         dialog = FilenamePatternManagerDialog(self.settings_service, self)
         # Optional: Connect signal if manager modifies patterns, to refresh combo live
@@ -268,24 +298,22 @@ class SettingsDialog(QDialog):
 
     def accept(self):
         """Save settings when OK is clicked."""
+        if not self._ui_built: # Never shown: there is nothing to save
+            super().accept()
+            return
         log_debug("Saving settings from dialog.")
-        self.settings_service.set_setting("theme", self.theme_combo.currentText(), save=False)
-        self.settings_service.set_setting("logging_enabled", self.logging_checkbox.isChecked(), save=False)
-        self.settings_service.set_setting("auto_save_enabled", self.auto_save_checkbox.isChecked(), save=False)
-        self.settings_service.set_setting("request_delay", self.request_delay_spin.value(), save=False)
-        self.settings_service.set_setting("retry_count", self.retry_count_spin.value(), save=False)
-        self.settings_service.set_setting("retry_delay", self.retry_delay_spin.value(), save=False)
-        self.settings_service.set_setting(constants.SAVE_TEXT_FILE_ENABLED, self.save_text_file_checkbox.isChecked(), save=False)
-        self.settings_service.set_setting(constants.EMBED_METADATA_ENABLED, self.embed_metadata_checkbox.isChecked(), save=False)
-        # Removed the line referencing self.filename_widget
-
-        # Save filename pattern selection
-        selected_pattern_name = self.pattern_combo.currentText()
-        # Use set_setting to handle updating both name and pattern string keys
-        self.settings_service.set_setting(constants.ACTIVE_FILENAME_PATTERN_NAME_KEY, selected_pattern_name, save=False)
-
-        # Perform final save
-        self.settings_service._save_settings() # Call private save method once
+        new_values = {"theme": self.theme_combo.currentText()}
+        new_values.update((key, getattr(self, attr_name).isChecked()) for attr_name, *_, key, _ in _CHECKBOX_SETTINGS)
+        new_values.update((key, getattr(self, attr_name).value()) for attr_name, *_, key, _ in _SPIN_SETTINGS)
+        # set_setting also updates the active pattern string for this key
+        new_values[constants.ACTIVE_FILENAME_PATTERN_NAME_KEY] = self.pattern_combo.currentText()
+        get_setting = self.settings_service.get_setting # Bound once for the comparison below
+        changed_values = {key: value for key, value in new_values.items() if get_setting(key) != value}
+        if not changed_values:
+            log_debug("No settings changed; skipping save.")
+            super().accept()
+            return
+        self.settings_service.set_settings(changed_values) # Applies all values, then saves once
         super().accept()
 
     def reject(self):
@@ -2,7 +2,6 @@
 import re
 import time
 import mimetypes
-import traceback
 import copy
 from pathlib import Path
 from typing import Optional, List, Dict, Any
@@ -11,10 +10,11 @@ import os
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QPushButton, QGroupBox, QComboBox, QDoubleSpinBox,
     QSpinBox, QPlainTextEdit, QCheckBox, QScrollArea, QFileDialog, QHBoxLayout,
-    QSpacerItem, QSizePolicy, QProgressBar, QGridLayout, QFrame, QApplication, QDialog, QLineEdit 
+    QSpacerItem, QSizePolicy, QProgressBar, QGridLayout, QFrame, QApplication, QDialog, QLineEdit,
+    QAbstractSpinBox
 )
-from PyQt6.QtCore import pyqtSignal, Qt, QThread, QObject, pyqtSlot, QSize, QTimer, QEvent, QCoreApplication, QMetaObject
-from PyQt6.QtGui import QPixmap, QImage, QIcon 
+from PyQt6.QtCore import pyqtSignal, Qt, QThread, QObject, pyqtSlot, QSize, QTimer, QEvent, QCoreApplication, QMetaObject, QRunnable, QThreadPool
+from PyQt6.QtGui import QPixmap, QImage, QIcon, QTextCursor
 
 # --- Project Imports ---
 from utils import constants
@@ -40,11 +40,87 @@ from core.image_processor import ImageProcessor
 from .safety_settings_dialog import SafetySettingsDialog
 
 
+# Configuration grid row labels: (text, row, column)
+_CONFIG_GRID_LABELS = (
+    ("API Key:", 0, 0),
+    ("Model:", 1, 0),
+    ("Temp:", 2, 0),
+    ("Top P:", 2, 2),
+    ("Max Tokens:", 3, 0),
+)
+# Model parameter spin boxes: (attribute, class, object name, min, max, step, decimals, tooltip, row, column)
+_PARAM_SPIN_SPECS = (
+    ("temperature_spin", QDoubleSpinBox, "temperatureSpinSingleMode", 0.0, 2.0, 0.05, 2,
+     "Controls randomness (0.0=deterministic, higher=more random).", 2, 1),
+    ("top_p_spin", QDoubleSpinBox, "topPSpinSingleMode", 0.0, 1.0, 0.05, 2,
+     "Nucleus sampling: Considers tokens until probability sum reaches this value.", 2, 3),
+    ("max_tokens_spin", QSpinBox, "maxTokensSpinSingleMode", 1, 8192, 1, None,
+     "Maximum number of tokens to generate in the response.", 3, 1),
+)
+
+class _WheelBlocker(QObject):
+    """Event filter that swallows wheel events, so scrolling the page can't change combo/spin box values."""
+
+    def eventFilter(self, source: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Wheel:
+            event.accept()
+            return True
+        return False
+
+
+class _ModelListSignals(QObject):
+    """Signal carrier for _ModelListTask (QRunnable cannot declare signals)."""
+    loaded = pyqtSignal(int, bool, object) # request token, client valid?, model dicts
+
+
+class _ModelListTask(QRunnable):
+    """
+    Validates an API key's client and lists its models on a QThreadPool thread.
+    Both are network round trips, which would otherwise block the GUI thread
+    while the widget is being built or a key is selected.
+    """
+
+    def __init__(self, token: int, gemini_handler: GeminiHandler, api_key_name: str, api_key_value: str, force_refresh: bool):
+        super().__init__()
+        self.token = token
+        self.gemini_handler = gemini_handler
+        self.api_key_name = api_key_name
+        self.api_key_value = api_key_value
+        self.force_refresh = force_refresh
+        self.signals = _ModelListSignals()
+
+    def run(self):
+        client_ok = False
+        models: List[Dict[str, Any]] = []
+        try:
+            client_ok = self.gemini_handler.get_or_initialize_client(self.api_key_name, self.api_key_value) is not None
+            if client_ok:
+                models = self.gemini_handler.list_models(
+                    api_key_name=self.api_key_name,
+                    api_key_value=self.api_key_value,
+                    force_refresh=self.force_refresh
+                )
+        except Exception as e:
+            log_error(f"Error loading models for key '{self.api_key_name}': {e}", exc_info=True)
+        self.signals.loaded.emit(self.token, client_ok, models)
+
+
+# Worker params that are not GeminiHandler.generate arguments
+_NON_HANDLER_PARAMS = frozenset((
+    'retry_count', 'retry_delay', # These are no longer used by the worker for rate limits
+    'resolved_wildcards_by_name',
+    'wildcard_resolver',
+    'resolved_prompt_text',
+    'unresolved_prompt_text'
+))
+
+
 # --- Worker Thread for API Calls ---
 class GenerationWorker(QObject):
     """Worker object to handle API calls in a separate thread."""
     finished = pyqtSignal(dict) # Signal emitting the result dictionary
     progress = pyqtSignal(str)  # Signal for status updates
+    text_chunk = pyqtSignal(str) # Response text fragments as they stream in (TEXT-only requests)
 
 
 
@@ -54,7 +130,8 @@ class GenerationWorker(QObject):
                  api_key_value: str,
                  params: dict,
                  resolved_wildcards_map: Dict[str, List[str]], # <<< Existing Explicit Argument
-                 image_filename_context: Optional[str] = None):
+                 image_filename_context: Optional[str] = None,
+                 filename_wildcard_values: Optional[Dict[str, str]] = None): # {"wildcard_value_N": value}, kept out of params
         super().__init__()
         log_debug(f"--- GenerationWorker __init__ CALLED (Key: {api_key_name}) ---")
         self.gemini_handler = gemini_handler
@@ -65,15 +142,15 @@ class GenerationWorker(QObject):
         self._is_running = False
         self.image_filename_context = image_filename_context
 
-        self.filename_wildcard_values = { k: v for k, v in params.items() if k.startswith("wildcard_value_") }
+        self.filename_wildcard_values = filename_wildcard_values.copy() if filename_wildcard_values else {}
         log_debug(f"[Worker.__init__] Received filename wildcard values: {self.filename_wildcard_values}")
 
         self.retry_count = params.get("retry_count", constants.DEFAULT_RETRY_COUNT)
         self.retry_delay = params.get("retry_delay", constants.DEFAULT_RETRY_DELAY)
 
-        # --- Store DEEP COPY of the EXPLICIT map ---
-        self._initial_resolved_wildcards_by_name = copy.deepcopy(resolved_wildcards_map)
-        log_info(f"[Worker.__init__] Stored DEEP COPY of explicit resolved_wildcards_map: {self._initial_resolved_wildcards_by_name}")
+        # --- Store a COPY of the EXPLICIT map (values are lists of immutable strings, so copying the lists suffices) ---
+        self._initial_resolved_wildcards_by_name = {name: values[:] for name, values in resolved_wildcards_map.items()}
+        log_info(f"[Worker.__init__] Stored copy of explicit resolved_wildcards_map: {self._initial_resolved_wildcards_by_name}")
 
         # --- Store resolved and unresolved prompts passed in params ---
         self.resolved_prompt = params.get("resolved_prompt_text", "") # Get RESOLVED prompt
@@ -101,13 +178,12 @@ class GenerationWorker(QObject):
             "resolved_prompt": self.resolved_prompt,
             "image_filename_context": self.image_filename_context,
             "resolved_wildcards_by_name": self._initial_resolved_wildcards_by_name,
-            **self.filename_wildcard_values
+            "filename_wildcard_values": self.filename_wildcard_values # Nested, so receivers need no prefix scan
         }
 
         if self._is_cancelled:
             log_info(f"GenerationWorker (Thread {thread_id}, Key: {self.api_key_name}) cancelled before start.")
-            result = {"status": "cancelled", "error_message": "Operation cancelled."}
-            result.update(base_result)
+            result = {"status": "cancelled", "error_message": "Operation cancelled.", **base_result}
             self.finished.emit(result)
             return
 
@@ -115,22 +191,19 @@ class GenerationWorker(QObject):
         log_debug(f"GenerationWorker: Making single API call attempt...")
         try:
             # Prepare args for the handler generate call
-            generate_args = {
-                k: v for k, v in self.params.items()
-                if k not in [
-                    'retry_count', 'retry_delay', # These are no longer used by the worker for rate limits
-                    'resolved_wildcards_by_name',
-                    'wildcard_resolver',
-                    'resolved_prompt_text',
-                    'unresolved_prompt_text'
-                ] and not k.startswith("wildcard_value_")
-            }
+            # (filename wildcard values arrive separately, so params needs no prefix scan)
+            generate_args = {k: v for k, v in self.params.items() if k not in _NON_HANDLER_PARAMS}
             generate_args["prompt_text"] = self.resolved_prompt # Pass the resolved prompt
 
+            # generate_args is built fresh above and GeminiHandler.generate only reads its
+            # arguments (image_paths, safety_settings_dict), so it is passed without a copy
+            # Only stream when someone is listening for the fragments
+            text_chunk_callback = self.text_chunk.emit if self.receivers(self.text_chunk) > 0 else None
             handler_result = self.gemini_handler.generate(
                 api_key_name=self.api_key_name,
                 api_key_value=self.api_key_value,
-                **copy.deepcopy(generate_args)
+                text_chunk_callback=text_chunk_callback,
+                **generate_args
             )
             result = handler_result # This is the result of the single attempt
 
@@ -139,12 +212,12 @@ class GenerationWorker(QObject):
 
         except Exception as e:
             log_error(f"Exception in GenerationWorker run method (Key: {self.api_key_name}): {e}", exc_info=True)
-            tb_str = traceback.format_exc()
-            result = {"status": "error", "error_message": f"Worker thread error: {e}\nTraceback:\n{tb_str}"}
+            result = {"status": "error", "error_message": f"Worker thread error: {type(e).__name__}: {e}"}
         # --- End single API call attempt ---
 
         # --- Final Result Processing ---
-        result.update(base_result) # Add base info to the final result
+        # Add base info to the handler's dict in place (base keys such as resolved_prompt take precedence)
+        result.update(base_result)
 
         if self._is_cancelled and result.get("status") != "cancelled":
             # If cancellation happened during the API call (which is hard to detect from here cleanly without more complex IPC)
@@ -170,6 +243,9 @@ class SingleModeWidget(QWidget):
     """Widget for handling single API key interactions."""
     status_update = pyqtSignal(str, int) # message, timeout
 
+    # Result image: fast rescale while the window is being resized, smooth once it settles
+    RESULT_SMOOTH_RESCALE_MS = 150
+
 
     def __init__(self,
                  settings_service: SettingsService,
@@ -196,6 +272,8 @@ class SingleModeWidget(QWidget):
 
         self._current_api_key_name: Optional[str] = None
         self._current_api_key_value: Optional[str] = None # Store the actual key value when selected
+        self._model_list_token = 0 # Bumped per _ModelListTask; stale results are dropped
+        self._model_list_request: Optional[tuple] = None # (key name, key value, force_refresh) of the latest task
         self._selected_image_paths: List[Path] = []
         self._generation_thread: Optional[QThread] = None
         self._generation_worker: Optional[GenerationWorker] = None
@@ -208,15 +286,10 @@ class SingleModeWidget(QWidget):
         # --- Persistent Worker Thread for Single Mode ---
         # Create a persistent thread when the widget is initialized.
         # This thread will run the GenerationWorker for each request.
+        # It is started by _ensure_worker_thread on the first generation, so
+        # sessions that never generate here don't keep an idle OS thread.
         self._worker_thread = QThread(self)
         self._worker_thread.setObjectName("SingleModeWorkerThread")
-        # Start the thread's event loop immediately so it's ready when needed.
-        try:
-            self._worker_thread.start()
-            log_debug("SingleMode: Persistent worker thread started.")
-        except Exception as e:
-            log_critical(f"SingleMode: Failed to start persistent worker thread: {e}", exc_info=True)
-            # Handle this error, maybe disable generation? For now, log and hope for the best.
 
 
         # --- Timer for Continuous Loop Scheduling ---
@@ -226,27 +299,27 @@ class SingleModeWidget(QWidget):
         self._loop_timer.setObjectName("SingleModeLoopTimer")
         self._loop_timer.setSingleShot(True) # Ensure it only fires once per start
 
+        # --- Timer for the smooth result-image rescale after a resize burst ---
+        self._smooth_rescale_timer = QTimer(self)
+        self._smooth_rescale_timer.setObjectName("SingleModeSmoothRescaleTimer")
+        self._smooth_rescale_timer.setSingleShot(True)
+        self._smooth_rescale_timer.setInterval(self.RESULT_SMOOTH_RESCALE_MS)
+
         # --- Image/Result Display State ---
         self._full_result_pixmap: Optional[QPixmap] = None # Stores the last generated full image for resizing
+        # (source cacheKey, label width, label height, fast?, scaled cacheKey) of the pixmap last put in the label
+        self._scaled_result_key: Optional[tuple] = None
         # Initialize _thumbnail_loaded flag. This is needed to differentiate between
         # a displayed result image (not _thumbnail_loaded) and a static thumbnail
         # loaded from an input image (_thumbnail_loaded).
         self._thumbnail_loaded: bool = False
 
 
-        self._setup_ui()
+        self._wheel_blocker = _WheelBlocker(self) # One filter object shared by all wheel-sensitive inputs
+        self._setup_ui() # Also installs the wheel-blocking event filters
         self._connect_signals()
         self._load_initial_data()
 
-        # Install event filters for desired widgets to block wheel events
-        self.temperature_spin.installEventFilter(self)
-        self.top_p_spin.installEventFilter(self)
-        self.max_tokens_spin.installEventFilter(self)
-        self.api_key_combo.installEventFilter(self)
-        self.model_combo.installEventFilter(self)
-        self.prompt_combo.installEventFilter(self)
-        log_debug("Single Mode: Event filters installed for parameter spin boxes and combo boxes.")
-
         self.filename_generator = FilenameGeneratorService(self.settings_service)
         self._sequential_mode_enabled: bool = False
         self._sequential_image_queue: List[Path] = []
@@ -257,6 +330,18 @@ class SingleModeWidget(QWidget):
         self._loaded_prompt_slot_key: Optional[str] = None # Stores the slot key if prompt was loaded from manager
 
 
+    def _ensure_worker_thread(self) -> bool:
+        """Starts the persistent worker thread's event loop if needed; returns whether it is running."""
+        if self._worker_thread is None:
+            return False
+        if not self._worker_thread.isRunning():
+            try:
+                self._worker_thread.start()
+                log_debug("SingleMode: Persistent worker thread started.")
+            except Exception as e:
+                log_critical(f"SingleMode: Failed to start persistent worker thread: {e}", exc_info=True)
+        return self._worker_thread.isRunning()
+
     # Add closeEvent handler for clean thread shutdown
     def closeEvent(self, event):
         log_info("SingleModeWidget received closeEvent. Shutting down worker thread.")
@@ -289,68 +374,44 @@ class SingleModeWidget(QWidget):
         top_controls_grid_layout = QGridLayout(top_controls_group)
         top_controls_grid_layout.setObjectName("configGridLayoutSingleMode")
 
+        # Row labels: (text, row, column)
+        for label_text, row, column in _CONFIG_GRID_LABELS:
+            top_controls_grid_layout.addWidget(QLabel(label_text), row, column)
+
         # Row 0: API Key
-        # config_api_key_label = QLabel("API Key:") # Simple labels often don't need names unless highly specific styling is needed
-        top_controls_grid_layout.addWidget(QLabel("API Key:"), 0, 0)
         self.api_key_combo = QComboBox()
         self.api_key_combo.setObjectName("apiKeyComboSingleMode")
         self.api_key_combo.setToolTip("Select the API Key to use for this session.")
         top_controls_grid_layout.addWidget(self.api_key_combo, 0, 1, 1, 2) # Span 2 columns
-        self.api_key_combo.installEventFilter(self)
         self.manage_keys_button = QPushButton("Manage...")
         self.manage_keys_button.setObjectName("manageKeysButtonSingleMode")
         self.manage_keys_button.setToolTip("Open the API Key Manager.")
         top_controls_grid_layout.addWidget(self.manage_keys_button, 0, 3)
 
         # Row 1: Model
-        # config_model_label = QLabel("Model:")
-        top_controls_grid_layout.addWidget(QLabel("Model:"), 1, 0)
         self.model_combo = QComboBox()
         self.model_combo.setObjectName("modelComboSingleMode")
         self.model_combo.setToolTip("Select the Gemini model to use. [IMG] indicates likely image support.")
         self.model_combo.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         self.model_combo.setEnabled(False) # Initialize as disabled
         top_controls_grid_layout.addWidget(self.model_combo, 1, 1, 1, 2) # Span 2 columns
-        self.model_combo.installEventFilter(self)
         self.refresh_models_button = QPushButton("Refresh")
         self.refresh_models_button.setObjectName("refreshModelsButtonSingleMode")
         self.refresh_models_button.setToolTip("Refresh the list of available models (requires valid API key).")
         self.refresh_models_button.setEnabled(False) # Initialize as disabled
         top_controls_grid_layout.addWidget(self.refresh_models_button, 1, 3)
 
-        # Row 2: Model Parameters (Temp, TopP)
-        # config_temp_label = QLabel("Temp:")
-        top_controls_grid_layout.addWidget(QLabel("Temp:"), 2, 0)
-        self.temperature_spin = QDoubleSpinBox()
-        self.temperature_spin.setObjectName("temperatureSpinSingleMode")
-        self.temperature_spin.setRange(0.0, 2.0)      # Range 0.0 to 2.0 (correct)
-        self.temperature_spin.setSingleStep(0.05)
-        self.temperature_spin.setDecimals(2)
-        self.temperature_spin.setToolTip("Controls randomness (0.0=deterministic, higher=more random).")
-        top_controls_grid_layout.addWidget(self.temperature_spin, 2, 1)
-        self.temperature_spin.installEventFilter(self)
-
-        # config_top_p_label = QLabel("Top P:")
-        top_controls_grid_layout.addWidget(QLabel("Top P:"), 2, 2)
-        self.top_p_spin = QDoubleSpinBox()
-        self.top_p_spin.setObjectName("topPSpinSingleMode")
-        self.top_p_spin.setRange(0.0, 1.0)
-        self.top_p_spin.setSingleStep(0.05)
-        self.top_p_spin.setDecimals(2)
-        self.top_p_spin.setToolTip("Nucleus sampling: Considers tokens until probability sum reaches this value.")
-        top_controls_grid_layout.addWidget(self.top_p_spin, 2, 3)
-        self.top_p_spin.installEventFilter(self)
-
-        # Row 3: Max Tokens, Reset, Safety
-        # config_max_tokens_label = QLabel("Max Tokens:")
-        top_controls_grid_layout.addWidget(QLabel("Max Tokens:"), 3, 0)
-        self.max_tokens_spin = QSpinBox()
-        self.max_tokens_spin.setObjectName("maxTokensSpinSingleMode")
-        self.max_tokens_spin.setRange(1, 8192)
-        self.max_tokens_spin.setSingleStep(1)
-        self.max_tokens_spin.setToolTip("Maximum number of tokens to generate in the response.")
-        top_controls_grid_layout.addWidget(self.max_tokens_spin, 3, 1)
-        self.max_tokens_spin.installEventFilter(self)
+        # Rows 2-3: Model Parameters (Temp, Top P, Max Tokens)
+        for attr_name, spin_class, object_name, minimum, maximum, step, decimals, tooltip, row, column in _PARAM_SPIN_SPECS:
+            spin = spin_class()
+            spin.setObjectName(object_name)
+            spin.setRange(minimum, maximum)
+            spin.setSingleStep(step)
+            if decimals is not None:
+                spin.setDecimals(decimals)
+            spin.setToolTip(tooltip)
+            top_controls_grid_layout.addWidget(spin, row, column)
+            setattr(self, attr_name, spin) # e.g. self.temperature_spin
 
         self.reset_params_button = QPushButton("Reset Params")
         self.reset_params_button.setObjectName("resetParamsButtonSingleMode")
@@ -369,6 +430,12 @@ class SingleModeWidget(QWidget):
         top_controls_grid_layout.setColumnStretch(2, 1)
         top_controls_grid_layout.setColumnStretch(3, 0)
 
+        # Block wheel changes on every combo/spin box of the grid with one pass
+        for index in range(top_controls_grid_layout.count()):
+            widget = top_controls_grid_layout.itemAt(index).widget()
+            if isinstance(widget, (QComboBox, QAbstractSpinBox)):
+                widget.installEventFilter(self._wheel_blocker)
+
         self.main_layout.addWidget(top_controls_group)
 
         # --- Prompt and Image Area ---
@@ -388,7 +455,7 @@ class SingleModeWidget(QWidget):
         self.prompt_combo.setToolTip("Load a saved prompt from the Prompt Manager.")
         self.prompt_combo.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         prompt_controls_layout.addWidget(self.prompt_combo)
-        self.prompt_combo.installEventFilter(self)
+        self.prompt_combo.installEventFilter(self._wheel_blocker)
         self.manage_prompts_button = QPushButton("Manage...")
         self.manage_prompts_button.setObjectName("managePromptsButtonSingleMode")
         self.manage_prompts_button.setToolTip("Open the Prompt Manager.")
@@ -565,6 +632,7 @@ class SingleModeWidget(QWidget):
         self.continuous_checkbox.toggled.connect(self._set_internal_continuous)
         # Connect the loop timer's timeout signal to the method that handles scheduling the next run
         self._loop_timer.timeout.connect(self._try_start_next_generation)
+        self._smooth_rescale_timer.timeout.connect(self._scale_and_set_pixmap)
 
 
         self.generate_button.clicked.connect(self._handle_generate_button_click)
@@ -577,7 +645,7 @@ class SingleModeWidget(QWidget):
         self.open_save_folder_button.clicked.connect(self._open_output_folder)
         
     def _load_initial_data(self):
-        """Load API keys, prompts, models, and settings."""
+        """Load API keys, prompts and settings; models arrive asynchronously via _ModelListTask."""
         log_debug("SingleMode: Loading initial data...")
         self.update_api_key_list() # This will trigger _on_api_key_selected if a key is selected
         self.update_prompt_list()
@@ -628,23 +696,6 @@ class SingleModeWidget(QWidget):
         self.max_tokens_spin.setValue(constants.DEFAULT_MAX_OUTPUT_TOKENS)
         self.status_update.emit("Parameters reset to defaults.", 3000)    
 
-    def eventFilter(self, source: QObject, event: QEvent) -> bool:
-        """Filters out Wheel events over specific child widgets."""
-        if event.type() == QEvent.Type.Wheel:
-            widgets_to_block = [
-                self.temperature_spin,
-                self.top_p_spin,
-                self.max_tokens_spin,
-                self.api_key_combo,
-                self.model_combo,
-                self.prompt_combo # <<< ADD THIS LINE
-            ]
-            if source in widgets_to_block:
-                log_debug(f"Single Mode: Ignoring wheel event on {source.objectName() or source.__class__.__name__}")
-                event.accept()
-                return True
-
-        return super().eventFilter(source, event)
         
     
     
@@ -990,7 +1041,7 @@ class SingleModeWidget(QWidget):
         # Get full prompt data including thumbnail paths
         prompts_data = self.prompt_service.get_all_prompts_full()
         # Sort slots numerically for consistent order
-        sorted_slots = sorted(prompts_data.keys(), key=lambda k: int(k.split('_')[-1]) if k.startswith("slot_") else float('inf'))
+        sorted_slots = self.prompt_service.get_sorted_slot_keys()
 
         item_found = False
         index_to_select = 0 # Default to placeholder
@@ -1082,6 +1133,7 @@ class SingleModeWidget(QWidget):
 
         # --- Reset state if placeholder selected ---
         if selected_key_name is None:
+            self._model_list_token += 1 # Drop any key validation still in flight
             self._current_api_key_name = None
             self._current_api_key_value = None
             self.model_combo.clear()
@@ -1103,11 +1155,16 @@ class SingleModeWidget(QWidget):
         # Check if the selected key is the same as the one already active in this instance
         if selected_key_name == self._current_api_key_name:
              log_debug(f"SingleMode: Same key '{selected_key_name}' re-selected.")
+             # A validation for another key may still be running; the user went back, so drop it
+             self._model_list_token += 1
              # Even if the same key is selected, ensure the UI state is correctly reflecting
              # whether models are loaded and available.
              is_client_ready = self.gemini_handler.is_client_available(selected_key_name)
-             models_cached = selected_key_name in self.gemini_handler.available_models_cache
-             models_loaded = models_cached and bool(self.gemini_handler.available_models_cache[selected_key_name])
+             cached_models = self.gemini_handler.get_cached_models(selected_key_name)
+             models_loaded = bool(cached_models)
+             if models_loaded and self.model_combo.count() == 0:
+                 # The combo was cleared for the abandoned key; show this key's models again
+                 self._populate_model_combo(cached_models)
 
              # Ensure UI buttons reflect this state
              self.model_combo.setEnabled(models_loaded)
@@ -1142,50 +1199,67 @@ class SingleModeWidget(QWidget):
         self._sequential_image_queue = []
         self._sequential_current_index = -1
         self._update_image_label()
-        QApplication.processEvents() # Allow UI to update
-
-        # Attempt to get/initialize the client for this key
-        client_instance = self.gemini_handler.get_or_initialize_client(selected_key_name, key_value)
-
-        if client_instance:
-            log_info(f"SingleMode: Client for key '{selected_key_name}' validated/retrieved.")
-            # --- Store the new active key name and value for this instance ---
-            self._current_api_key_name = selected_key_name
-            self._current_api_key_value = key_value
-            # Save the new key name as the last used API key in settings
-            self.settings_service.set_setting("last_used_api_key_name", self._current_api_key_name)
-
-            # Enable refresh models button now that we have a valid client instance
-            self.refresh_models_button.setEnabled(True)
-            self.status_update.emit(f"API key '{selected_key_name}' active.", 0) # Status update after validation
-
-            # --- Check Model Cache BEFORE loading models ---
-            cached_models = self.gemini_handler.available_models_cache.get(selected_key_name)
-
-            if cached_models:
-                # Cache Hit: Models are already available for this key
-                log_info(f"SingleMode: Using cached models for key: {selected_key_name}")
-                # Populate the UI dropdown directly from the cached list
-                self._populate_model_combo(cached_models)
-                # Update status to indicate readiness *after* populating models
-                if self.model_combo.count() > 0 and self.model_combo.isEnabled():
-                    self.status_update.emit("Ready.", 3000) # Set Ready status only if models were successfully populated
-            else:
-                # Cache Miss: Models need to be fetched for this key
-                log_info(f"SingleMode: No cached models found for key '{selected_key_name}'. Fetching models...")
-                # Call _load_models to fetch, cache, and populate the UI.
-                # Pass force_refresh=False as it's the initial load for this key.
-                # _load_models will handle status updates related to fetching.
-                self._load_models(force_refresh=False)
 
+        cached_models = self.gemini_handler.get_cached_models(selected_key_name)
+        if cached_models and self.gemini_handler.is_client_available(selected_key_name):
+            # Cache Hit: client already validated and models available, nothing to wait for
+            log_info(f"SingleMode: Using cached models for key: {selected_key_name}")
+            self._activate_api_key(selected_key_name, key_value, cached_models, force_refresh=False)
         else:
+            # Client validation and model listing are network calls; run them off the GUI thread.
+            # _on_model_list_loaded activates the key (or resets to the placeholder) when they finish.
+            log_info(f"SingleMode: Validating key '{selected_key_name}' and fetching models in the background...")
+            self._start_model_list_task(selected_key_name, key_value, force_refresh=False)
+
+    def _start_model_list_task(self, api_key_name: str, api_key_value: str, force_refresh: bool):
+        """Starts a _ModelListTask on the global QThreadPool; any earlier task's result becomes stale."""
+        self._model_list_token += 1
+        self._model_list_request = (api_key_name, api_key_value, force_refresh)
+        task = _ModelListTask(self._model_list_token, self.gemini_handler, api_key_name, api_key_value, force_refresh)
+        task.signals.loaded.connect(self._on_model_list_loaded, Qt.ConnectionType.QueuedConnection)
+        QThreadPool.globalInstance().start(task)
+
+    @pyqtSlot(int, bool, object)
+    def _on_model_list_loaded(self, token: int, client_ok: bool, models: List[Dict[str, Any]]):
+        """Receives a _ModelListTask result on the GUI thread."""
+        if token != self._model_list_token:
+            log_debug(f"SingleMode: Ignoring stale model list result (token {token}).")
+            return
+        api_key_name, api_key_value, force_refresh = self._model_list_request
+
+        if not client_ok:
             # Initialization failed (error logged within get_or_initialize_client)
             # Reset state to placeholder
-            show_error_message(self, "API Key Error", f"Failed to initialize or validate API key '{selected_key_name}'. Check the key and API access.")
+            show_error_message(self, "API Key Error", f"Failed to initialize or validate API key '{api_key_name}'. Check the key and API access.")
             self.status_update.emit("API Key validation failed.", 5000)
             self.api_key_combo.setCurrentIndex(0) # Reset to placeholder
             # Explicitly call handler for placeholder index using QTimer to ensure state is fully reset
             QTimer.singleShot(0, lambda: self._on_api_key_selected(0))
+            return
+
+        self._activate_api_key(api_key_name, api_key_value, models, force_refresh)
+
+    def _activate_api_key(self, api_key_name: str, api_key_value: str, models: List[Dict[str, Any]], force_refresh: bool):
+        """Makes a validated key the active one for this widget and shows its models."""
+        if api_key_name != self._current_api_key_name:
+            log_info(f"SingleMode: Client for key '{api_key_name}' validated/retrieved.")
+            # --- Store the new active key name and value for this instance ---
+            self._current_api_key_name = api_key_name
+            self._current_api_key_value = api_key_value
+            # Save the new key name as the last used API key in settings
+            self.settings_service.set_setting("last_used_api_key_name", api_key_name)
+
+        # Enable refresh models button now that we have a valid client instance
+        self.refresh_models_button.setEnabled(True)
+        # This method will also handle enabling/disabling the generate button.
+        self._populate_model_combo(models)
+
+        # Update status based on whether models were successfully loaded and populated
+        if self.model_combo.count() > 0 and self.model_combo.isEnabled():
+            self.status_update.emit("Model list refreshed." if force_refresh else "Ready.", 3000)
+        else:
+            # _populate_model_combo handles adding error message to combo box
+            self.status_update.emit("Failed to load models.", 5000)
 
 
 
@@ -1247,14 +1321,13 @@ class SingleModeWidget(QWidget):
         self.status_update.emit("Refreshing model list...", 0)
         self.model_combo.setEnabled(False)
         self.generate_button.setEnabled(False)
-        QApplication.processEvents()
         self._load_models(force_refresh=True)
-        self.status_update.emit("Model list refreshed.", 3000)
 
     def _load_models(self, force_refresh=False):
         """
-        Loads available models into the dropdown for the current key by calling
-        the GeminiHandler and then populating the UI via _populate_model_combo.
+        Loads available models into the dropdown for the current key. The
+        GeminiHandler call runs on the thread pool (_ModelListTask) and
+        _on_model_list_loaded populates the UI via _populate_model_combo.
         """
         # Use the currently stored key name and value for this instance
         api_key_name = self._current_api_key_name
@@ -1268,36 +1341,9 @@ class SingleModeWidget(QWidget):
             self.status_update.emit("Select API Key to load models.", 0) # More informative message
             return
 
-        # Set status message before potentially slow API call
         self.status_update.emit(f"Loading models for '{api_key_name}'...", 0)
-        QApplication.processEvents() # Ensure UI updates
-
-        # Fetch models using the handler.
         # The handler will use its cache unless force_refresh is True.
-        models = self.gemini_handler.list_models(
-            api_key_name=api_key_name,
-            api_key_value=api_key_value,
-            force_refresh=force_refresh
-        )
-
-        # Use the helper method to populate the UI combo box with the results
-        # This method will also handle enabling/disabling the generate button.
-        self._populate_model_combo(models)
-
-        # Update status based on whether models were successfully loaded and populated
-        if self.model_combo.count() > 0 and self.model_combo.isEnabled():
-             # Models were successfully loaded (either from cache or API)
-             if force_refresh:
-                  self.status_update.emit("Model list refreshed.", 3000)
-             else:
-                  # If not forcing refresh, it means we fetched them now because they weren't cached
-                  self.status_update.emit("Models loaded.", 3000)
-                  # Optionally reset to "Ready." after a delay if you prefer that over "Models loaded."
-                  QTimer.singleShot(4000, lambda: self.status_update.emit("Ready.", 3000) if not self._is_running else None)
-
-        else:
-             # _populate_model_combo handles adding error message to combo box
-             self.status_update.emit("Failed to load models.", 5000)
+        self._start_model_list_task(api_key_name, api_key_value, force_refresh)
 
     @pyqtSlot(int)
     def _on_model_selected(self, index):
@@ -1317,7 +1363,7 @@ class SingleModeWidget(QWidget):
         self.generate_button.setEnabled(bool(self._current_api_key_name))
 
         # Use the cache associated with the *current* API key
-        models_for_current_key = self.gemini_handler.available_models_cache.get(self._current_api_key_name, [])
+        models_for_current_key = self.gemini_handler.get_cached_models(self._current_api_key_name) or []
         model_info = next((m for m in models_for_current_key if m['name'] == model_name), None)
         supports_images = model_info.get('likely_image_support', False) if model_info else False
 
@@ -1570,7 +1616,7 @@ class SingleModeWidget(QWidget):
               log_error(f"{instance_log_prefix}: Wildcard resolution error: {wc_err}", exc_info=True); self._set_ui_generating(False); self._update_button_style(); show_error_message(self, "Wildcard Error", f"Wildcard resolution failed: {wc_err}"); return
 
          # --- Validate Image Support & Prepare Images ---
-         models_for_current_key = self.gemini_handler.available_models_cache.get(api_key_name, [])
+         models_for_current_key = self.gemini_handler.get_cached_models(api_key_name) or []
          model_info = next((m for m in models_for_current_key if m['name'] == model_name), None)
          supports_images = model_info.get('likely_image_support', False) if model_info else False
          image_list_for_worker = []; current_image_for_context = None
@@ -1623,8 +1669,7 @@ class SingleModeWidget(QWidget):
              "request_timeout": None,
              "retry_count": self.settings_service.get_setting("retry_count", constants.DEFAULT_RETRY_COUNT),
              "retry_delay": self.settings_service.get_setting("retry_delay", constants.DEFAULT_RETRY_DELAY),
-             # resolved_wildcards_by_name is now passed explicitly to worker, not needed here
-             **filename_wildcard_values
+             # resolved_wildcards_by_name and filename_wildcard_values are passed explicitly to worker, not needed here
          }
          log_info(f"[{instance_log_prefix} PRE-WORKER INIT] Passing explicit resolved_map_copy")
 
@@ -1639,7 +1684,7 @@ class SingleModeWidget(QWidget):
          # --- Create Worker and Move to Persistent Thread ---
          log_debug(f"{instance_log_prefix}: Creating GenerationWorker...")
          _image_filename_context = current_image_for_context.name if current_image_for_context else None
-         if not hasattr(self, '_worker_thread') or self._worker_thread is None or not self._worker_thread.isRunning():
+         if not self._ensure_worker_thread():
              log_critical(f"{instance_log_prefix}: Worker thread error!"); self._continuous_loop_active = False; self._set_ui_generating(False); self._update_button_style(); self.status_update.emit("Internal Error: Thread."); return
 
          self._generation_worker = GenerationWorker(
@@ -1648,6 +1693,7 @@ class SingleModeWidget(QWidget):
              params=gen_params, # Pass other params
              resolved_wildcards_map=resolved_map_copy, # Pass the map explicitly
              image_filename_context=_image_filename_context,
+             filename_wildcard_values=filename_wildcard_values,
          )
          self._generation_worker.moveToThread(self._worker_thread)
 
@@ -1655,6 +1701,7 @@ class SingleModeWidget(QWidget):
          log_debug(f"{instance_log_prefix}: Connecting worker signals...")
          self._generation_worker.finished.connect(self._on_generation_finished)
          self._generation_worker.finished.connect(self._generation_worker.deleteLater)
+         self._generation_worker.text_chunk.connect(self._append_streamed_text)
 
          # --- Trigger Worker ---
          log_info(f"{instance_log_prefix}: Invoking worker.run()...")
@@ -1757,7 +1804,7 @@ class SingleModeWidget(QWidget):
          if not disable_config and self.model_combo.isEnabled():
               model_name = self.model_combo.itemData(self.model_combo.currentIndex())
               if model_name and self._current_api_key_name:
-                    models_for_current_key = self.gemini_handler.available_models_cache.get(self._current_api_key_name, [])
+                    models_for_current_key = self.gemini_handler.get_cached_models(self._current_api_key_name) or []
                     model_info = next((m for m in models_for_current_key if m['name'] == model_name), None)
                     model_supports_images = model_info.get('likely_image_support', False) if model_info else False
          self.add_image_button.setEnabled(not disable_config and model_supports_images)
@@ -1841,7 +1888,7 @@ class SingleModeWidget(QWidget):
             image_bytes = result.get("image_bytes"); image_mime = result.get("image_mime")
             text_result = result.get("text_result", "")
             image_filename_context = result.get("image_filename_context")
-            filename_wildcard_values = { k: v for k, v in result.items() if k.startswith("wildcard_value_") }
+            filename_wildcard_values = result.get("filename_wildcard_values", {})
             log_debug(f"{instance_log_prefix}: Received pre-resolved filename wildcard values: {filename_wildcard_values}")
 
             if status == "rate_limited":
@@ -2033,6 +2080,17 @@ class SingleModeWidget(QWidget):
 
          
  
+    @pyqtSlot(str)
+    def _append_streamed_text(self, text_fragment: str):
+        """Appends streamed response text to the result box while the request is running."""
+        if self.sender() is not self._generation_worker:
+            return # Fragment from a worker that was cancelled or replaced
+        # Own cursor: appending doesn't move the user's selection; _on_generation_finished sets the final text
+        cursor = QTextCursor(self.result_text_edit.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text_fragment)
+
+
     def _display_image(self, image_bytes: bytes) -> bool: # Return bool
         """Safely displays image bytes in the result label."""
         try:
@@ -2061,8 +2119,9 @@ class SingleModeWidget(QWidget):
             return False # Indicate failure
  
  
-    def _scale_and_set_pixmap(self):
-         """Scales the stored _full_result_pixmap to fit the label."""
+    @pyqtSlot()
+    def _scale_and_set_pixmap(self, fast: bool = False):
+         """Scales the stored _full_result_pixmap to fit the label (fast=True: cheap interim scaling during resizes)."""
          if not self._full_result_pixmap or self._full_result_pixmap.isNull():
               # Keep existing text like "No image generated" if no pixmap
               return
@@ -2075,13 +2134,22 @@ class SingleModeWidget(QWidget):
              self.result_image_label.setPixmap(self._full_result_pixmap)
              return
 
+         current_pm = self.result_image_label.pixmap()
+         # Same source at the same label size, still on display: skip the smooth rescale
+         last_key = self._scaled_result_key
+         if (last_key is not None and current_pm is not None
+                 and last_key == (self._full_result_pixmap.cacheKey(), label_size.width(), label_size.height(), fast, current_pm.cacheKey())):
+              return
+
+         transformation = Qt.TransformationMode.FastTransformation if fast else Qt.TransformationMode.SmoothTransformation
          scaled_pixmap = self._full_result_pixmap.scaled(label_size,
                                                Qt.AspectRatioMode.KeepAspectRatio,
-                                               Qt.TransformationMode.SmoothTransformation)
-         current_pm = self.result_image_label.pixmap()
+                                               transformation)
          # Avoid redundant sets if the scaled size hasn't visually changed
          if not current_pm or scaled_pixmap.cacheKey() != current_pm.cacheKey():
               self.result_image_label.setPixmap(scaled_pixmap)
+         self._scaled_result_key = (self._full_result_pixmap.cacheKey(), label_size.width(), label_size.height(), fast,
+                                    self.result_image_label.pixmap().cacheKey())
 
 
 
@@ -2193,8 +2261,11 @@ class SingleModeWidget(QWidget):
     def resizeEvent(self, event):
         """Rescales the displayed image when the widget is resized."""
         super().resizeEvent(event)
-        # Rescale the image currently in the label, using the stored original if available
-        self._scale_and_set_pixmap() # Use helper method
+        # Rescale the image currently in the label, using the stored original if available:
+        # cheaply now, then smoothly once resizing has paused
+        if self._full_result_pixmap is not None:
+            self._scale_and_set_pixmap(fast=True)
+            self._smooth_rescale_timer.start()
         
         
     @pyqtSlot()
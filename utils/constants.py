@@ -43,6 +43,8 @@ DEFAULT_AUTO_SAVE_ENABLED = True
 DEFAULT_SAVE_TEXT_FILE_ENABLED = True # Save text file by default
 DEFAULT_EMBED_METADATA_ENABLED = True # Embed metadata by default
 DEFAULT_THEME = "Auto" # Auto, Light, Dark
+PIXMAP_CACHE_LIMIT_KB = 64 * 1024 # QPixmapCache budget shared by thumbnail caches
+PROMPT_THUMBNAIL_SIZE = (260, 260) # Stored prompt thumbnails match the Prompt Manager label, so no runtime rescale is needed
 DEFAULT_FILENAME_PATTERN = "{date}_{time}_{model}_{prompt_hash}" # Example: 20231027_153000_gemini-pro_a1b2c3d4.png
 DEFAULT_FILENAME_PATTERN_NAME = "Default"
 SAVED_FILENAME_PATTERNS_KEY = "saved_filename_patterns"
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 import json
 import os
+import stat
+import tempfile
 from pathlib import Path
 from typing import Any, Optional, Dict, List, Tuple
 
@@ -14,7 +16,15 @@ from .constants import APP_DIR
 
 
 ICON_BASE_DIR = APP_DIR / "icons"
+# Mode a plain open() would give new files; mkstemp always creates 0600
+_process_umask = os.umask(0)
+os.umask(_process_umask)
+_DEFAULT_NEW_FILE_MODE = 0o666 & ~_process_umask
 _icon_dir_warning_logged = False
+# Loaded icons keyed by (theme folder, icon name); QIcon is implicitly shared, so handing out the same one is cheap
+_themed_icon_cache: Dict[Tuple[str, str], QIcon] = {}
+# (THEMES_DIR st_mtime_ns, discovered themes); adding/removing/renaming a .qss bumps the mtime
+_custom_themes_cache: Optional[Tuple[int, List[Tuple[str, Path]]]] = None
 
 
 def load_json_file(file_path: Path, default: Any = None) -> Any:
@@ -60,20 +70,45 @@ def load_json_file(file_path: Path, default: Any = None) -> Any:
 
 
 def save_json_file(file_path: Path, data: Any) -> bool:
-    """Safely saves data to a JSON file."""
+    """
+    Safely saves data to a JSON file.
+    The document is serialized in memory, written with a single write() to a temp
+    file next to the target and swapped in with os.replace, so readers never see
+    a half-written file.
+    """
+    tmp_path = None
     try:
+        payload = json.dumps(data, indent=4, ensure_ascii=False).encode('utf-8')
         # Ensure parent directory exists
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        with file_path.open('w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+        try:
+            os.write(fd, payload)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        # Keep the target's permissions (or the usual umask default for a new file)
+        try:
+            file_mode = stat.S_IMODE(os.stat(file_path).st_mode)
+        except FileNotFoundError:
+            file_mode = _DEFAULT_NEW_FILE_MODE
+        os.chmod(tmp_path, file_mode)
+        os.replace(tmp_path, file_path)
+        tmp_path = None
         # log_debug(f"JSON data saved successfully to {file_path}") # Optional: debug log on success
         return True
-    except (TypeError, OSError) as e:
+    except (TypeError, ValueError, OSError) as e:
         log_error(f"Error saving JSON file {file_path}: {e}")
         return False
     except Exception as e:
         log_error(f"Unexpected error saving JSON file {file_path}: {e}", exc_info=True)
         return False
+    finally:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
 
 def show_error_message(parent=None, title="Error", message="An unexpected error occurred."):
     """Displays a standardized error message box."""
@@ -114,12 +149,21 @@ def discover_custom_themes() -> List[Tuple[str, Path]]:
     Returns:
         A list of tuples: (theme_name, theme_path)
         Returns empty list if directory doesn't exist or no themes found.
+        The scan is cached until the directory's modification time changes.
     """
-    custom_themes = []
-    if not THEMES_DIR.is_dir():
+    global _custom_themes_cache
+    try:
+        themes_dir_mtime = THEMES_DIR.stat().st_mtime_ns if THEMES_DIR.is_dir() else None
+    except OSError:
+        themes_dir_mtime = None
+    if themes_dir_mtime is None:
         log_warning(f"Custom themes directory not found: {THEMES_DIR}")
+        _custom_themes_cache = None
         return []
+    if _custom_themes_cache is not None and _custom_themes_cache[0] == themes_dir_mtime:
+        return list(_custom_themes_cache[1])
 
+    custom_themes = []
     log_debug(f"Scanning for custom themes in: {THEMES_DIR}")
     for file_path in sorted(THEMES_DIR.glob("*.qss")):
         if file_path.is_file():
@@ -127,7 +171,8 @@ def discover_custom_themes() -> List[Tuple[str, Path]]:
             custom_themes.append((theme_name, file_path))
             log_debug(f"Found custom theme: '{theme_name}' at {file_path}")
 
-    return custom_themes
+    _custom_themes_cache = (themes_dir_mtime, custom_themes)
+    return list(custom_themes)
 
 
 
@@ -322,6 +367,10 @@ def get_themed_icon(icon_name: str) -> QIcon:
     theme_folder = "dark" if is_dark_theme else "light"
     # Note: Add logic here if you want custom theme names to map to icon folders
 
+    cached_icon = _themed_icon_cache.get((theme_folder, icon_name))
+    if cached_icon is not None:
+        return cached_icon
+
     themed_path = ICON_BASE_DIR / theme_folder / icon_name
     default_path = ICON_BASE_DIR / "default" / icon_name
 
@@ -342,7 +391,9 @@ def get_themed_icon(icon_name: str) -> QIcon:
     # --- Load Icon ---
     try:
         # log_debug(f"Loading icon from: {icon_path_to_load}") # Optional debug log
-        return QIcon(str(icon_path_to_load))
+        icon = QIcon(str(icon_path_to_load))
+        _themed_icon_cache[(theme_folder, icon_name)] = icon
+        return icon
     except Exception as e:
         # Log an error if loading fails *even though the file exists*
         log_error(f"Failed to load existing icon file '{icon_path_to_load}': {e}")